@@ -0,0 +1,171 @@
+"""
+Response caches for StatsBomb API calls.
+
+- memoize_ttl: in-process TTL cache (no disk access on repeated calls)
+- cached: on-disk cache. DataFrames are stored as parquet, everything else
+  as JSON, under data/cache/statsbomb/{endpoint}/{key}.{ext}. Entries older
+  than the configured TTL are refetched.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+import pandas as pd
+
+CACHE_DIR = Path(__file__).resolve().parents[1] / "data" / "cache" / "statsbomb"
+
+# Seasons that are still being played (data changes), everything else is closed
+CURRENT_SEASON_IDS = {317}
+CURRENT_SEASON_TTL = 60 * 60          # 1h
+CLOSED_SEASON_TTL = 24 * 60 * 60      # 24h
+
+
+def season_ttl(competition_id: int, season_id: int) -> int:
+    """TTL for a (competition, season) payload: short for the current season, long for closed ones."""
+    return CURRENT_SEASON_TTL if int(season_id) in CURRENT_SEASON_IDS else CLOSED_SEASON_TTL
+
+
+def season_key(competition_id: int, season_id: int) -> str:
+    """Cache key for a (competition, season) payload."""
+    return f"{competition_id}_{season_id}"
+
+
+def _default_key(method_name: str, arguments: dict) -> str:
+    """sha1 of the method name and its bound arguments."""
+    raw = repr((method_name, sorted(arguments.items())))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _bind_arguments(signature: inspect.Signature, args: tuple, kwargs: dict) -> dict:
+    """Normalize positional/keyword arguments of a method call (self excluded)."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return {k: v for k, v in bound.arguments.items() if k != "self"}
+
+
+def _read(parquet_path: Path, json_path: Path, ttl: int) -> Any:
+    """Return a fresh cached payload, or None on miss/expiry."""
+    now = time.time()
+    for path in (parquet_path, json_path):
+        if path.exists() and now - path.stat().st_mtime < ttl:
+            try:
+                if path.suffix == ".parquet":
+                    return pd.read_parquet(path)
+                with open(path, "r") as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Error reading cache entry {path}: {e}")
+    return None
+
+
+def _write(result: Any, parquet_path: Path, json_path: Path) -> None:
+    """Persist a payload atomically (temp file + rename); unserializable payloads are simply not cached."""
+    target = parquet_path if isinstance(result, pd.DataFrame) else json_path
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        os.makedirs(target.parent, exist_ok=True)
+        if isinstance(result, pd.DataFrame):
+            result.to_parquet(tmp_path, compression="zstd")
+        else:
+            with open(tmp_path, "w") as f:
+                json.dump(result, f)
+        # Readers never see a partially written entry
+        os.replace(tmp_path, target)
+    except Exception as e:
+        print(f"Error writing cache entry for {parquet_path.stem}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def cached(
+    ttl_seconds: Union[int, Callable[..., int]],
+    key_fn: Optional[Callable[..., str]] = None,
+    cache_dir: Path = CACHE_DIR
+):
+    """
+    Cache a client method's result on disk.
+
+    Args:
+        ttl_seconds: TTL in seconds, or a callable receiving the method's arguments
+        key_fn: Callable receiving the method's arguments and returning the cache key
+                (defaults to sha1 of method name + arguments)
+        cache_dir: Root cache directory (one subdirectory per method)
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            arguments = _bind_arguments(signature, (self,) + args, kwargs)
+
+            key = key_fn(**arguments) if key_fn else _default_key(func.__name__, arguments)
+            ttl = ttl_seconds(**arguments) if callable(ttl_seconds) else ttl_seconds
+
+            endpoint_dir = cache_dir / func.__name__
+            parquet_path = endpoint_dir / f"{key}.parquet"
+            json_path = endpoint_dir / f"{key}.json"
+
+            result = _read(parquet_path, json_path, ttl)
+            if result is not None:
+                return result
+
+            result = func(self, *args, **kwargs)
+            if result is not None:
+                _write(result, parquet_path, json_path)
+            return result
+
+        return wrapper
+    return decorator
+
+
+def _shallow_copy(result: Any) -> Any:
+    """A new DataFrame object over the same data (other payloads are returned as is)."""
+    return result.copy(deep=False) if isinstance(result, pd.DataFrame) else result
+
+
+def memoize_ttl(ttl_seconds: int, maxsize: int = 64):
+    """
+    Cache a client method's result in memory for ttl_seconds.
+
+    Keyed by the method's normalized arguments; the least recently stored
+    entry is evicted beyond maxsize. None results are not cached. DataFrames
+    are handed out as shallow copies, so a caller adding, dropping or
+    renaming columns doesn't change what later callers get.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        entries: "OrderedDict[str, tuple]" = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key = repr(sorted(_bind_arguments(signature, (self,) + args, kwargs).items()))
+            now = time.monotonic()
+
+            with lock:
+                entry = entries.get(key)
+                if entry is not None and entry[0] > now:
+                    return _shallow_copy(entry[1])
+
+            result = func(self, *args, **kwargs)
+            if result is not None:
+                with lock:
+                    entries[key] = (now + ttl_seconds, result)
+                    entries.move_to_end(key)
+                    while len(entries) > maxsize:
+                        entries.popitem(last=False)
+            return _shallow_copy(result)
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
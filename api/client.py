@@ -8,8 +8,17 @@ from typing import Optional, Dict, List
 import streamlit as st  # Add this import
 from statsbombpy import sb
 import warnings
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+
+from .cache import cached, memoize_ttl, season_key, season_ttl
+
+COMPETITIONS_TTL = 60 * 60  # 1h (on disk)
+COMPETITIONS_MEMORY_TTL = 5 * 60  # 5min (in memory)
+SEASON_MEMORY_TTL = 60 * 60  # 1h (in memory)
 
 # Remove: load_dotenv() - not needed for Streamlit secrets
 
@@ -22,6 +31,15 @@ class StatsBombClient:
         self.username = st.secrets["SB_USERNAME"]
         self.password = st.secrets["SB_PASSWORD"]
         self.has_credentials = bool(self.username and self.password)
+        self._creds_cached = {'user': self.username, 'passwd': self.password} if self.has_credentials else None
+        
+        # Shared HTTP session (keep-alive connection pooling for direct API calls)
+        self.session = requests.Session()
+        self.session.headers.update({'Accept': 'application/json', 'Accept-Encoding': 'gzip, deflate'})
+        if self.has_credentials:
+            self.session.auth = HTTPBasicAuth(self.username, self.password)
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        self.session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries))
         
         if self.has_credentials:
             print(f"StatsBomb client initialized with credentials: {self.username[:3]}***")
@@ -29,59 +47,56 @@ class StatsBombClient:
             print("StatsBomb client initialized without credentials (open data only)")
     
     def _get_creds(self) -> Optional[Dict[str, str]]:
-        """Get credentials if available."""
-        if self.has_credentials:
-            return {'user': self.username, 'passwd': self.password}
-        return None
+        """Get credentials if available (built once in __init__)."""
+        return self._creds_cached
+    
+    def _call_sb(self, func, **kwargs):
+        """Call a statsbombpy function, passing credentials when available."""
+        creds = self._get_creds()
+        return func(creds=creds, **kwargs) if creds else func(**kwargs)
     
+    @memoize_ttl(ttl_seconds=COMPETITIONS_MEMORY_TTL, maxsize=1)
+    @cached(ttl_seconds=COMPETITIONS_TTL)
     def competitions(self):
         """Get all available competitions."""
         try:
-            creds = self._get_creds()
-            if creds:
-                return sb.competitions(creds=creds)
-            else:
-                return sb.competitions()
+            return self._call_sb(sb.competitions)
         except Exception as e:
             print(f"Error fetching competitions: {e}")
             return None
     
+    @memoize_ttl(ttl_seconds=SEASON_MEMORY_TTL, maxsize=64)
+    @cached(ttl_seconds=season_ttl, key_fn=season_key)
     def team_season_stats(self, competition_id: int, season_id: int):
         """Get team season statistics for a specific competition and season."""
         try:
-            creds = self._get_creds()
-            if creds:
-                return sb.team_season_stats(competition_id=competition_id, season_id=season_id, creds=creds)
-            else:
-                return sb.team_season_stats(competition_id=competition_id, season_id=season_id)
+            return self._call_sb(sb.team_season_stats, competition_id=competition_id, season_id=season_id)
         except Exception as e:
             print(f"Error fetching team season stats: {e}")
             return None
     
+    @memoize_ttl(ttl_seconds=SEASON_MEMORY_TTL, maxsize=64)
+    @cached(ttl_seconds=season_ttl, key_fn=season_key)
     def matches(self, competition_id: int, season_id: int):
         """Get matches for a specific competition and season."""
         try:
-            creds = self._get_creds()
-            if creds:
-                return sb.matches(competition_id=competition_id, season_id=season_id, creds=creds)
-            else:
-                return sb.matches(competition_id=competition_id, season_id=season_id)
+            return self._call_sb(sb.matches, competition_id=competition_id, season_id=season_id)
         except Exception as e:
             print(f"Error fetching matches: {e}")
             return None
     
+    @memoize_ttl(ttl_seconds=SEASON_MEMORY_TTL, maxsize=64)
+    @cached(ttl_seconds=season_ttl, key_fn=season_key)
     def player_season_stats(self, competition_id: int, season_id: int):
         """Get player season statistics for a specific competition and season."""
         try:
-            creds = self._get_creds()
-            if creds:
-                return sb.player_season_stats(competition_id=competition_id, season_id=season_id, creds=creds)
-            else:
-                return sb.player_season_stats(competition_id=competition_id, season_id=season_id)
+            return self._call_sb(sb.player_season_stats, competition_id=competition_id, season_id=season_id)
         except Exception as e:
             print(f"Error fetching player season stats: {e}")
             return None
     
+    @memoize_ttl(ttl_seconds=SEASON_MEMORY_TTL, maxsize=64)
+    @cached(ttl_seconds=season_ttl, key_fn=season_key)
     def player_mapping(self, competition_id: int, season_id: int):
         """Get player mapping data for a specific competition and season via direct API call."""
         try:
@@ -94,20 +109,16 @@ class StatsBombClient:
                 'season-id': season_id
             }
             
-            # Make request with or without credentials
-            if self.has_credentials:
-                auth = HTTPBasicAuth(self.username, self.password)
-                response = requests.get(url, params=params, auth=auth)
-            else:
-                response = requests.get(url, params=params)
+            # Make request through the shared session (auth is attached to the session)
+            response = self.session.get(url, params=params, timeout=(3, 10))
             
-            # Check if request was successful
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"Player mapping API request failed with status {response.status_code}")
-                return None
+            # Check if request was successful, then decode the raw bytes with orjson
+            response.raise_for_status()
+            return orjson.loads(response.content)
                 
+        except requests.HTTPError:
+            print(f"Player mapping API request failed with status {response.status_code}")
+            return None
         except Exception as e:
             print(f"Error fetching player mapping: {e}")
             return None
@@ -20,7 +20,7 @@ st.set_page_config(
 
 def home_get_status(api_client):
     """
-    Get API connection status.
+    Get API connection status (the client memoizes competitions, so reruns are cheap).
     
     Args:
         api_client: The StatsBomb API client instance
@@ -145,4 +145,4 @@ with st.expander("📖 Methodology & Technical Details", expanded=False):
 
 # Footer
 st.markdown("---")
-st.markdown("*Built for ISAC2025 • Data via StatsBomb API (Hudl) • Player Analysis for Club América*")
\ No newline at end of file
+st.markdown("*Built for ISAC2025 • Data via StatsBomb API (Hudl) • Player Analysis for Club América*")
@@ -9,36 +9,50 @@ This module loads and caches performance metrics artifacts including:
 - Min/max ranges for absolute view scaling
 """
 
-import os
-import json
+import orjson
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+try:
+    import streamlit as st
+    _cache_resource = st.cache_resource
+except ImportError:  # Non-Streamlit contexts (scripts, tests)
+    _cache_resource = functools.lru_cache(maxsize=8)
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_DEFAULT_ARTIFACTS_DIR = "data/processed/performance_artifacts"
+
+# Merged percentiles/raw_metrics/axis_scores file written by scripts/build_performance_feather.py
+_COMBINED_FILE = "performance_all.feather"
+_FRAME_FILES = {
+    "percentiles": "performance_percentiles.parquet",
+    "raw_metrics": "performance_raw_metrics.parquet",
+    "axis_scores": "performance_axis_scores.parquet",
+}
+_JSON_FILES = (
+    "performance_axes.json",
+    "performance_benchmarks.json",
+    "performance_minmax.json",
+    "performance_config.json",
+)
+
 
 class PerformanceLoader:
     """Loads and caches performance artifacts."""
     
-    def __init__(self, artifacts_dir: str = "data/processed/performance_artifacts", season_id: str = None):
-        """Initialize the loader with artifacts directory."""
+    def __init__(self, artifacts_dir: str = _DEFAULT_ARTIFACTS_DIR, season_id: str = None):
+        """Initialize the loader with artifacts directory (relative paths resolve against the repo root)."""
         # If season_id is provided, use season-specific directory
         if season_id:
-            artifacts_dir = f"data/processed/performance_artifacts_{season_id}"
-        
-        # Use absolute path if relative path doesn't exist
-        if not os.path.exists(artifacts_dir):
-            # Try to find the correct path
-            possible_paths = [
-                f"C:/Users/carls/OneDrive/Dokumente/Uni/05 Semester/Marketing y Estrategia de Deportes/Projekt/Repo/ISAC2025/{artifacts_dir}",
-                artifacts_dir,
-                f"../{artifacts_dir}"
-            ]
-            for path in possible_paths:
-                if os.path.exists(path):
-                    artifacts_dir = path
-                    break
+            artifacts_dir = f"{_DEFAULT_ARTIFACTS_DIR}_{season_id}"
         
-        self.artifacts_dir = artifacts_dir
+        self.artifacts_dir: Path = _REPO_ROOT / artifacts_dir
         self._axes: Optional[List[Dict[str, Any]]] = None
         self._percentiles: Optional[pd.DataFrame] = None
         self._raw_metrics: Optional[pd.DataFrame] = None
@@ -46,39 +60,184 @@ class PerformanceLoader:
         self._benchmarks: Optional[Dict[str, Dict[str, float]]] = None
         self._minmax: Optional[Dict[str, Dict[str, float]]] = None
         self._config: Optional[Dict[str, Any]] = None
+        self._all_metrics: tuple = ()
+        self._axis_metrics_by_key: Dict[str, tuple] = {}
+        self._axes_compiled: Optional[tuple] = None
+        self._known_players: Optional[frozenset] = None
+        
+        # player_id (as str) -> row position, built once per loaded frame
+        self._percentiles_index: Dict[str, int] = {}
+        self._raw_metrics_index: Dict[str, int] = {}
+        self._axis_scores_index: Dict[str, int] = {}
+        
+        # Output keys and value matrices per frame, resolved once at load (the frames are then released)
+        self._percentile_keys: tuple = ()
+        self._percentile_values: np.ndarray = np.empty((0, 0))
+        self._raw_metric_keys: tuple = ()
+        self._raw_metric_values: np.ndarray = np.empty((0, 0))
+        self._score_keys: tuple = ()
+        self._score_values: np.ndarray = np.empty((0, 0))
+        
+        # (file name, size, mtime_ns) of every artifact file, taken when the artifacts are read
+        self._artifact_version: tuple = ()
 
     def _load_artifacts_if_needed(self) -> None:
-        """Load artifacts if not already loaded."""
-        if self._axes is None:
-            self._load_axes()
-        if self._percentiles is None:
-            self._load_percentiles()
-        if self._raw_metrics is None:
-            self._load_raw_metrics()
-        if self._axis_scores is None:
-            self._load_axis_scores()
-        if self._benchmarks is None:
-            self._load_benchmarks()
-        if self._minmax is None:
-            self._load_minmax()
-        if self._config is None:
-            self._load_config()
+        """Load artifacts if not already loaded (independent files are read concurrently)."""
+        # Frames are only ever loaded together, so the merged file is looked up once per load
+        if self._percentiles is None and (self.artifacts_dir / _COMBINED_FILE).exists():
+            frame_loaders = (("_percentiles", self._load_combined),)
+        else:
+            frame_loaders = (
+                ("_percentiles", self._load_percentiles),
+                ("_raw_metrics", self._load_raw_metrics),
+                ("_axis_scores", self._load_axis_scores),
+            )
+        pending = [
+            load for attr, load in (
+                ("_axes", self._load_axes),
+                *frame_loaders,
+                ("_benchmarks", self._load_benchmarks),
+                ("_minmax", self._load_minmax),
+                ("_config", self._load_config),
+            )
+            if getattr(self, attr) is None
+        ]
+        if not pending:
+            return
+        
+        self._artifact_version = self._stat_artifacts()
+        
+        # Each loader assigns its own attributes; pyarrow releases the GIL while decoding
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            for future in [executor.submit(load) for load in pending]:
+                future.result()
+
+    def _stat_artifacts(self) -> tuple:
+        """(file name, size, mtime_ns) of the artifact files that exist (a cheap data version)."""
+        version = []
+        for name in (_COMBINED_FILE, *_FRAME_FILES.values(), *_JSON_FILES):
+            try:
+                stat = (self.artifacts_dir / name).stat()
+            except OSError:
+                continue
+            version.append((name, stat.st_size, stat.st_mtime_ns))
+        return tuple(version)
+
+    @staticmethod
+    def _build_player_index(df: pd.DataFrame) -> Dict[str, int]:
+        """Map player_id (already a canonical str) to its first row position."""
+        index: Dict[str, int] = {}
+        if 'player_id' in df.columns:
+            for i, pid in enumerate(df['player_id'].tolist()):
+                index.setdefault(pid, i)
+        return index
+
+    @staticmethod
+    def _to_float_matrix(df: pd.DataFrame, cols: List[str], dtype: str = 'float64') -> np.ndarray:
+        """Extract columns as a contiguous float matrix (nulls become NaN)."""
+        if not cols:
+            return np.empty((len(df), 0), dtype=dtype)
+        numeric = df[cols].apply(pd.to_numeric, errors='coerce')
+        return numeric.to_numpy(dtype=dtype, na_value=np.nan)
+
+    @staticmethod
+    def _release_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """Drop a frame's rows once its values are extracted (only the column names are kept)."""
+        return pd.DataFrame(columns=df.columns)
+
+    @staticmethod
+    def _read_parquet_columns(path: Path, suffix: Optional[str] = None) -> pd.DataFrame:
+        """Read player_id plus the columns ending with suffix (all columns if no suffix)."""
+        columns = None
+        if suffix:
+            columns = [
+                name for name in pq.read_schema(path).names
+                if name == 'player_id' or name.endswith(suffix)
+            ]
+        table = pq.read_table(path, columns=columns, use_threads=True)
+        df = table.to_pandas(types_mapper=pd.ArrowDtype)
+        # Canonical string player_id so lookups never need int/str retries
+        if 'player_id' in df.columns:
+            df['player_id'] = df['player_id'].astype('string[pyarrow]')
+        return df
 
     def _load_axes(self) -> None:
         """Load performance axes definition."""
         try:
-            with open(os.path.join(self.artifacts_dir, "performance_axes.json"), "r") as f:
-                self._axes = json.load(f)
+            self._axes = orjson.loads((self.artifacts_dir / "performance_axes.json").read_bytes())
         except Exception as e:
             print(f"Error loading performance axes: {e}")
             self._axes = []
+        
+        # Flattened metric lookups, computed once per load
+        self._all_metrics = tuple(m for axis in self._axes for m in axis.get('metrics', []))
+        self._axis_metrics_by_key = {}
+        for axis in self._axes:
+            self._axis_metrics_by_key.setdefault(axis.get('key'), tuple(axis.get('metrics', [])))
+
+    def _set_percentiles(self, df: pd.DataFrame) -> None:
+        """Index a percentiles frame and extract its value matrix."""
+        self._percentiles_index = self._build_player_index(df)
+        cols = [c for c in df.columns if c != 'player_id' and c.endswith('_percentile')]
+        self._percentile_keys = tuple(c.replace('_percentile', '') for c in cols)
+        # Percentiles are 0-100, float32 is plenty and halves the matrix
+        self._percentile_values = self._to_float_matrix(df, cols, dtype='float32')
+        self._percentiles = self._release_frame(df)
+
+    def _set_raw_metrics(self, df: pd.DataFrame) -> None:
+        """Index a raw metrics frame and extract its value matrix."""
+        self._raw_metrics_index = self._build_player_index(df)
+        cols = [c for c in df.columns if c != 'player_id']
+        self._raw_metric_keys = tuple(cols)
+        # Missing raw values are reported as 0.0 (kept float64: per-90 rates and ids need the precision)
+        self._raw_metric_values = np.nan_to_num(self._to_float_matrix(df, cols), nan=0.0)
+        self._raw_metrics = self._release_frame(df)
+
+    def _set_axis_scores(self, df: pd.DataFrame) -> None:
+        """Index an axis scores frame and extract its value matrix."""
+        self._axis_scores_index = self._build_player_index(df)
+        cols = [c for c in df.columns if c != 'player_id' and c.endswith('_score')]
+        self._score_keys = tuple(c.replace('_score', '') for c in cols)
+        # Missing axis scores are reported as 0.0 (averaged percentiles, float32 like them)
+        self._score_values = np.nan_to_num(self._to_float_matrix(df, cols, dtype='float32'), nan=0.0)
+        self._axis_scores = self._release_frame(df)
+
+    def _load_combined(self) -> None:
+        """Load percentiles, raw metrics and axis scores from the merged Arrow file in one read."""
+        try:
+            with pa.memory_map(str(self.artifacts_dir / _COMBINED_FILE)) as source:
+                table = pa.ipc.open_file(source).read_all()
+            # Trusted as written by the build script (tests check it against the parquet sources)
+            player_id = table.column('player_id').cast(pa.string())
+        except Exception as e:
+            print(f"Error loading combined performance table: {e}")
+            table = None
+
+        for group, set_frame, load_frame in (
+            ("percentiles", self._set_percentiles, self._load_percentiles),
+            ("raw_metrics", self._set_raw_metrics, self._load_raw_metrics),
+            ("axis_scores", self._set_axis_scores, self._load_axis_scores),
+        ):
+            prefix = f"{group}/"
+            names = [n for n in table.column_names if n.startswith(prefix)] if table is not None else []
+            if not names:
+                # Family missing from the merged file: use its parquet file (if any)
+                load_frame()
+                continue
+            group_table = pa.table(
+                [player_id] + [table.column(n) for n in names],
+                names=['player_id'] + [n[len(prefix):] for n in names]
+            )
+            df = group_table.to_pandas(types_mapper=pd.ArrowDtype)
+            df['player_id'] = df['player_id'].astype('string[pyarrow]')
+            set_frame(df)
 
     def _load_percentiles(self) -> None:
         """Load performance percentiles data."""
         try:
-            self._percentiles = pd.read_parquet(
-                os.path.join(self.artifacts_dir, "performance_percentiles.parquet")
-            )
+            self._set_percentiles(self._read_parquet_columns(
+                self.artifacts_dir / _FRAME_FILES["percentiles"], "_percentile"
+            ))
         except Exception as e:
             print(f"Error loading performance percentiles: {e}")
             self._percentiles = pd.DataFrame()
@@ -86,9 +245,9 @@ class PerformanceLoader:
     def _load_raw_metrics(self) -> None:
         """Load raw metrics data."""
         try:
-            self._raw_metrics = pd.read_parquet(
-                os.path.join(self.artifacts_dir, "performance_raw_metrics.parquet")
-            )
+            self._set_raw_metrics(self._read_parquet_columns(
+                self.artifacts_dir / _FRAME_FILES["raw_metrics"]
+            ))
         except Exception as e:
             # Raw metrics file may not exist, which is OK
             self._raw_metrics = pd.DataFrame()
@@ -96,9 +255,9 @@ class PerformanceLoader:
     def _load_axis_scores(self) -> None:
         """Load performance axis scores data."""
         try:
-            self._axis_scores = pd.read_parquet(
-                os.path.join(self.artifacts_dir, "performance_axis_scores.parquet")
-            )
+            self._set_axis_scores(self._read_parquet_columns(
+                self.artifacts_dir / _FRAME_FILES["axis_scores"], "_score"
+            ))
         except Exception as e:
             print(f"Error loading performance axis scores: {e}")
             self._axis_scores = pd.DataFrame()
@@ -106,8 +265,7 @@ class PerformanceLoader:
     def _load_benchmarks(self) -> None:
         """Load performance benchmarks data."""
         try:
-            with open(os.path.join(self.artifacts_dir, "performance_benchmarks.json"), "r") as f:
-                self._benchmarks = json.load(f)
+            self._benchmarks = orjson.loads((self.artifacts_dir / "performance_benchmarks.json").read_bytes())
         except Exception as e:
             print(f"Error loading performance benchmarks: {e}")
             self._benchmarks = {}
@@ -115,8 +273,7 @@ class PerformanceLoader:
     def _load_minmax(self) -> None:
         """Load performance min/max ranges data."""
         try:
-            with open(os.path.join(self.artifacts_dir, "performance_minmax.json"), "r") as f:
-                self._minmax = json.load(f)
+            self._minmax = orjson.loads((self.artifacts_dir / "performance_minmax.json").read_bytes())
         except Exception as e:
             print(f"Error loading performance min/max: {e}")
             self._minmax = {}
@@ -124,8 +281,7 @@ class PerformanceLoader:
     def _load_config(self) -> None:
         """Load performance configuration data."""
         try:
-            with open(os.path.join(self.artifacts_dir, "performance_config.json"), "r") as f:
-                self._config = json.load(f)
+            self._config = orjson.loads((self.artifacts_dir / "performance_config.json").read_bytes())
         except Exception as e:
             print(f"Error loading performance config: {e}")
             self._config = {}
@@ -135,93 +291,116 @@ class PerformanceLoader:
         self._load_artifacts_if_needed()
         return self._axes or []
 
+    def get_axes_compiled(self) -> tuple:
+        """
+        Get the axes as (axis_key, axis_label, metric_keys, percentile_cols, raw_cols, score_col) tuples.
+        
+        The column indices point into the rows returned by get_player_value_rows
+        (-1 where the metric or axis has no column); resolved once per load.
+        """
+        self._load_artifacts_if_needed()
+        if self._axes_compiled is None:
+            percentile_col = {key: i for i, key in enumerate(self._percentile_keys)}
+            raw_col = {key: i for i, key in enumerate(self._raw_metric_keys)}
+            score_col = {key: i for i, key in enumerate(self._score_keys)}
+            self._axes_compiled = tuple(
+                (
+                    axis['key'],
+                    axis['label'],
+                    metrics,
+                    tuple(percentile_col.get(m, -1) for m in metrics),
+                    tuple(raw_col.get(m, -1) for m in metrics),
+                    score_col.get(axis['key'], -1)
+                )
+                for axis in self._axes or []
+                for metrics in (tuple(axis['metrics']),)
+            )
+        return self._axes_compiled
+
+    def has_player(self, player_id: str) -> bool:
+        """Check if the player has percentiles or axis scores (player_id matched as str)."""
+        self._load_artifacts_if_needed()
+        if self._known_players is None:
+            self._known_players = frozenset(self._percentiles_index).union(self._axis_scores_index)
+        return str(player_id) in self._known_players
+
+    def get_player_value_rows(self, player_id: str) -> tuple:
+        """
+        Get a player's (percentile, raw metric, axis score) value rows as arrays.
+        
+        Each row is None if the player is not in that artifact; index the rows with
+        the columns from get_axes_compiled.
+        """
+        pid = str(player_id)
+        self._load_artifacts_if_needed()
+        rows = []
+        for index, values in self._value_families():
+            idx = index.get(pid)
+            rows.append(None if idx is None else values[idx])
+        return tuple(rows)
+
+    def _value_families(self) -> tuple:
+        """(player index, value matrix) for percentiles, raw metrics and axis scores."""
+        return (
+            (self._percentiles_index, self._percentile_values),
+            (self._raw_metrics_index, self._raw_metric_values),
+            (self._axis_scores_index, self._score_values),
+        )
+
     def get_player_metric_row(self, player_id: str) -> Optional[Dict[str, Dict[str, float]]]:
-        """Get raw and percentile values for all metrics for a specific player."""
+        """Get raw and percentile values for all metrics for a specific player (player_id may be str or int; it is matched as str)."""
+        pid = str(player_id)
         self._load_artifacts_if_needed()
         
-        if self._percentiles.empty:
+        if not self._percentiles_index:
             return None
             
-        try:
-            # Find player data - try both string and integer conversion
-            player_data = None
-            
-            # Try as string first
-            if player_id in self._percentiles['player_id'].values:
-                player_data = self._percentiles[self._percentiles['player_id'] == player_id].iloc[0]
-            # Try as integer
-            elif int(player_id) in self._percentiles['player_id'].values:
-                player_data = self._percentiles[self._percentiles['player_id'] == int(player_id)].iloc[0]
-            
-            if player_data is not None:
-                result = {}
-                for col in self._percentiles.columns:
-                    if col != 'player_id' and col.endswith('_percentile'):
-                        metric_key = col.replace('_percentile', '')
-                        result[metric_key] = {
-                            'percentile': float(player_data[col]) if pd.notna(player_data[col]) else None
-                        }
-                return result
+        idx = self._percentiles_index.get(pid)
+        if idx is None:
             return None
+            
+        try:
+            row = self._percentile_values[idx]
+            return {
+                metric_key: {'percentile': None if missing else value}
+                for metric_key, missing, value in zip(self._percentile_keys, np.isnan(row).tolist(), row.tolist())
+            }
         except Exception as e:
             print(f"Error getting metric row for player {player_id}: {e}")
             return None
 
     def get_player_raw_metrics(self, player_id: str) -> Optional[Dict[str, float]]:
-        """Get raw metrics for a specific player."""
+        """Get raw metrics for a specific player (player_id may be str or int; it is matched as str)."""
+        pid = str(player_id)
         self._load_artifacts_if_needed()
         
-        if self._raw_metrics.empty:
+        if not self._raw_metrics_index:
             return None
             
-        try:
-            # Find player data - try both string and integer conversion
-            player_data = None
-            
-            # Try as string first
-            if player_id in self._raw_metrics['player_id'].values:
-                player_data = self._raw_metrics[self._raw_metrics['player_id'] == player_id].iloc[0]
-            # Try as integer
-            elif int(player_id) in self._raw_metrics['player_id'].values:
-                player_data = self._raw_metrics[self._raw_metrics['player_id'] == int(player_id)].iloc[0]
-            
-            if player_data is not None:
-                result = {}
-                for col in self._raw_metrics.columns:
-                    if col != 'player_id':
-                        result[col] = float(player_data[col]) if pd.notna(player_data[col]) else 0.0
-                return result
+        idx = self._raw_metrics_index.get(pid)
+        if idx is None:
             return None
+            
+        try:
+            return dict(zip(self._raw_metric_keys, self._raw_metric_values[idx].tolist()))
         except Exception as e:
             print(f"Error getting raw metrics for player {player_id}: {e}")
             return None
 
     def get_player_axis_scores(self, player_id: str) -> Optional[Dict[str, float]]:
-        """Get axis scores for a specific player."""
+        """Get axis scores for a specific player (player_id may be str or int; it is matched as str)."""
+        pid = str(player_id)
         self._load_artifacts_if_needed()
         
-        if self._axis_scores.empty:
+        if not self._axis_scores_index:
             return None
             
-        try:
-            # Find player data - try both string and integer conversion
-            player_data = None
-            
-            # Try as string first
-            if player_id in self._axis_scores['player_id'].values:
-                player_data = self._axis_scores[self._axis_scores['player_id'] == player_id].iloc[0]
-            # Try as integer
-            elif int(player_id) in self._axis_scores['player_id'].values:
-                player_data = self._axis_scores[self._axis_scores['player_id'] == int(player_id)].iloc[0]
-            
-            if player_data is not None:
-                result = {}
-                for col in self._axis_scores.columns:
-                    if col != 'player_id' and col.endswith('_score'):
-                        axis_key = col.replace('_score', '')
-                        result[axis_key] = float(player_data[col]) if pd.notna(player_data[col]) else 0.0
-                return result
+        idx = self._axis_scores_index.get(pid)
+        if idx is None:
             return None
+            
+        try:
+            return dict(zip(self._score_keys, self._score_values[idx].tolist()))
         except Exception as e:
             print(f"Error getting axis scores for player {player_id}: {e}")
             return None
@@ -231,6 +410,12 @@ class PerformanceLoader:
         self._load_artifacts_if_needed()
         return self._benchmarks.get(metric_key)
 
+    def get_benchmarks_bulk(self, metric_keys: List[str]) -> Dict[str, Dict[str, float]]:
+        """Get benchmarks for several metrics at once (metrics without benchmarks are omitted)."""
+        self._load_artifacts_if_needed()
+        benchmarks = self._benchmarks
+        return {key: benchmarks[key] for key in metric_keys if key in benchmarks}
+
     def get_minutes_threshold(self) -> int:
         """Get the minutes threshold for analysis."""
         self._load_artifacts_if_needed()
@@ -249,18 +434,17 @@ class PerformanceLoader:
     def get_all_metrics(self) -> List[str]:
         """Get list of all available metrics."""
         self._load_artifacts_if_needed()
-        metrics = []
-        for axis in self._axes or []:
-            metrics.extend(axis.get('metrics', []))
-        return metrics
+        return list(self._all_metrics)
 
     def get_axis_metrics(self, axis_key: str) -> List[str]:
         """Get metrics for a specific axis."""
         self._load_artifacts_if_needed()
-        for axis in self._axes or []:
-            if axis.get('key') == axis_key:
-                return axis.get('metrics', [])
-        return []
+        return list(self._axis_metrics_by_key.get(axis_key, ()))
+
+    def get_artifact_version(self) -> tuple:
+        """Fingerprint of the loaded artifact files; changes whenever a file is rewritten."""
+        self._load_artifacts_if_needed()
+        return self._artifact_version
 
     def is_loaded(self) -> bool:
         """Check if artifacts are loaded."""
@@ -272,3 +456,11 @@ class PerformanceLoader:
             self._minmax is not None and
             self._config is not None
         )
+
+
+@_cache_resource
+def get_loader(season_id: Optional[str] = None) -> PerformanceLoader:
+    """Get a shared, fully loaded PerformanceLoader for a season (artifacts are immutable per season)."""
+    loader = PerformanceLoader(season_id=season_id)
+    loader._load_artifacts_if_needed()
+    return loader
@@ -5,8 +5,90 @@ This module orchestrates the building of performance profiles by combining
 data from the performance loader with player identity information.
 """
 
+import functools
+import threading
+import types
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional
-from .loader import PerformanceLoader
+
+import numpy as np
+
+from .loader import PerformanceLoader, get_loader
+
+# Striker position mappings
+_STRIKER_POSITIONS = frozenset({'Centre Forward', 'Left Centre Forward', 'Right Centre Forward'})
+
+# Season string -> StatsBomb season ID
+_SEASON_IDS = types.MappingProxyType({
+    "2024/25": "317",
+    "2023/24": "281",
+    "2022/23": "235",
+    "2021/22": "108"
+})
+
+# Metric key -> human-readable label
+_METRIC_LABELS = types.MappingProxyType({
+    'touches_box_90': 'Touches in Box /90',
+    'np_xg_90': 'NP xG /90',
+    'np_xg_per_shot': 'xG / Shot',
+    'finishing_quality': 'PS xG – xG',
+    'xa_90': 'xA /90',
+    'key_passes_90': 'Key Passes /90',
+    'obv_pass_90': 'OBV Pass /90',
+    'xa_per_shot_assist': 'xA / Key Pass',
+    'deep_progressions_90': 'Deep Progressions /90',
+    'passing_ratio': 'Passing Ratio',
+    'dribble_ratio': 'Dribble Ratio',
+    'obv_dribble_carry_90': 'OBV Dribble /90',
+    'defensive_actions_90': 'Defensive Actions /90',
+    'tackles_interceptions_90': 'Tackles & Interceptions /90',
+    'aerial_ratio': 'Aerial Ratio',
+    'npxgxa_90': 'NP xG + xA /90',
+    'obv_90': 'OBV /90',
+    'positive_outcome_score': 'Positive Outcome Score'
+})
+
+# Constant profile meta (copied into each payload)
+_PROFILE_META = types.MappingProxyType({
+    "data_version": "v1",
+    "computed_at": "2025-01-27",
+    "is_striker": True
+})
+
+
+# Built profile axes kept in memory (LRU), keyed by (artifacts dir, artifact version, player_id)
+_PROFILE_CACHE_SIZE = 1024
+_profile_axes_cache: "OrderedDict[tuple, Optional[List[Dict[str, Any]]]]" = OrderedDict()
+_profile_axes_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=128)
+def _fallback_metric_label(metric_key: str) -> str:
+    """Title-case label for metrics without an explicit label."""
+    return metric_key.replace('_', ' ').title()
+
+
+def _copy_axes(axes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Copy of cached profile axes (every nested dict and list is fresh, values are shared)."""
+    return [
+        {**axis, "metrics": [{**metric, "benchmarks": dict(metric["benchmarks"])} for metric in axis["metrics"]]}
+        for axis in axes
+    ]
+
+
+def _has_values(row: Optional[np.ndarray]) -> bool:
+    """True if a loader value row exists and has at least one column."""
+    return row is not None and row.size > 0
+
+
+def _take_values(row: Optional[np.ndarray], cols: tuple) -> List[Optional[float]]:
+    """Values of row at cols as floats (None for a missing row, a -1 column or NaN)."""
+    if not _has_values(row):
+        return [None] * len(cols)
+    return [
+        None if col < 0 or value != value else value
+        for col, value in zip(cols, row.take(cols).tolist())
+    ]
 
 
 class PerformanceService:
@@ -15,7 +97,7 @@ class PerformanceService:
     def __init__(self, loader: PerformanceLoader = None, season_id: str = None):
         """Initialize the service with a performance loader."""
         self.season_id = season_id
-        self.loader = loader or PerformanceLoader(season_id=season_id)
+        self.loader = loader or get_loader(season_id)
     
     def build_performance_profile(
         self, 
@@ -40,59 +122,97 @@ class PerformanceService:
             minutes: Minutes played
             
         Returns:
-            Performance profile payload or None if not found
+            Performance profile payload (a fresh dict) or None if not found
         """
         # Check if player is a striker
         if primary_position and not self.is_striker(primary_position, secondary_position):
             return None
         
-        # Get performance data
-        metric_data = self.loader.get_player_metric_row(player_id)
-        axis_scores = self.loader.get_player_axis_scores(player_id)
-        raw_metrics = self.loader.get_player_raw_metrics(player_id)
+        axes = self._get_player_axes(player_id)
+        if axes is None:
+            return None
+        
+        return self._assemble_profile(player_id, player_name, team_name, season, minutes, _copy_axes(axes))
+    
+    def _get_player_axes(self, player_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        A player's profile axes, memoized per artifacts directory, artifact version and player_id.
+        
+        The axes only depend on the loaded artifacts, so repeated requests reuse them;
+        callers must copy them (see _copy_axes) before handing them out.
+        """
+        key = (str(self.loader.artifacts_dir), self.loader.get_artifact_version(), str(player_id))
+        with _profile_axes_lock:
+            if key in _profile_axes_cache:
+                _profile_axes_cache.move_to_end(key)
+                return _profile_axes_cache[key]
+        
+        axes = self._build_player_axes(player_id)
+        with _profile_axes_lock:
+            _profile_axes_cache[key] = axes
+            while len(_profile_axes_cache) > _PROFILE_CACHE_SIZE:
+                _profile_axes_cache.popitem(last=False)
+        return axes
+    
+    def _build_player_axes(self, player_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Build a player's profile axes with their metrics (None if the player has no data)."""
+        # Unknown players skip the row lookups entirely
+        if not self.loader.has_player(player_id):
+            return None
+        
+        # Get performance data (value rows indexed by the compiled axes' columns)
+        percentile_row, raw_row, score_row = self.loader.get_player_value_rows(player_id)
         
         # If no data found, return None
-        if not metric_data and not axis_scores:
+        if not _has_values(percentile_row) and not _has_values(score_row):
             return None
         
-        # Get axes definitions
-        axes_def = self.loader.get_axes()
+        # Get compiled axes and their benchmarks
+        axes_compiled = self.loader.get_axes_compiled()
+        bench_map = self._get_axes_benchmarks(axes_compiled)
         
-        # Build axes with metrics
+        get_label = self._get_metric_label
         axes = []
-        for axis_def in axes_def:
-            axis_key = axis_def['key']
-            axis_score = axis_scores.get(axis_key, 0.0) if axis_scores else 0.0
-            
-            # Get metrics for this axis
-            metrics = []
-            for metric_key in axis_def['metrics']:
-                metric_data_item = metric_data.get(metric_key, {}) if metric_data else {}
-                benchmarks = self.loader.get_benchmarks(metric_key)
-                
-                # Get raw metric value
-                raw_value = raw_metrics.get(metric_key) if raw_metrics else None
-                
-                # Get metric label (simplified for now)
-                metric_label = self._get_metric_label(metric_key)
-                
-                metrics.append({
-                    'key': metric_key,
-                    'label': metric_label,
-                    'raw': raw_value,
-                    'percentile': metric_data_item.get('percentile'),
-                    'benchmarks': benchmarks or {}
-                })
-            
+        for axis_key, axis_label, metric_keys, percentile_cols, raw_cols, score_col in axes_compiled:
+            # Slice each row once per axis; missing columns and NaN percentiles become None
+            percentiles = _take_values(percentile_row, percentile_cols)
+            raws = _take_values(raw_row, raw_cols)
+            score = score_row[score_col].item() if score_col >= 0 and _has_values(score_row) else 0.0
             axes.append({
                 'key': axis_key,
-                'label': axis_def['label'],
-                'score': axis_score,
-                'metrics': metrics
+                'label': axis_label,
+                'score': score,
+                'metrics': [
+                    {
+                        'key': metric_key,
+                        'label': get_label(metric_key),
+                        'raw': raw,
+                        'percentile': percentile,
+                        'benchmarks': dict(bench_map.get(metric_key) or {})
+                    }
+                    for metric_key, raw, percentile in zip(metric_keys, raws, percentiles)
+                ]
             })
-        
-        # Build performance profile payload
-        profile = {
+        return axes
+    
+    def _get_axes_benchmarks(self, axes_compiled: tuple) -> Dict[str, Dict[str, float]]:
+        """Get benchmarks for every metric of the axes in one loader call."""
+        return self.loader.get_benchmarks_bulk(
+            [metric_key for axis in axes_compiled for metric_key in axis[2]]
+        )
+    
+    def _assemble_profile(
+        self,
+        player_id: str,
+        player_name: Optional[str],
+        team_name: Optional[str],
+        season: str,
+        minutes: int,
+        axes: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the performance profile payload around a player's axes."""
+        minutes_threshold = self.loader.get_minutes_threshold()
+        return {
             "player": {
                 "id": player_id,
                 "name": player_name or "Unknown Player",
@@ -101,65 +221,25 @@ class PerformanceService:
             },
             "season": season,
             "axes": axes,
-            "notes": f"Percentiles relative to Liga MX strikers (≥{self.loader.get_minutes_threshold()}'), {season}",
-            "minutes_threshold": self.loader.get_minutes_threshold(),
-            "meta": {
-                "data_version": "v1",
-                "computed_at": "2025-01-27",
-                "is_striker": True
-            }
+            "notes": f"Percentiles relative to Liga MX strikers (≥{minutes_threshold}'), {season}",
+            "minutes_threshold": minutes_threshold,
+            "meta": dict(_PROFILE_META)
         }
-        
-        return profile
     
     def is_striker(self, primary_position: str, secondary_position: str = None) -> bool:
         """Check if a player is a striker based on position."""
-        striker_positions = {
-            'Centre Forward', 'Left Centre Forward', 'Right Centre Forward'
-        }
-        
-        if primary_position in striker_positions:
-            return True
-        
-        if secondary_position and secondary_position in striker_positions:
-            return True
-        
-        return False
+        return primary_position in _STRIKER_POSITIONS or (
+            secondary_position is not None and secondary_position in _STRIKER_POSITIONS
+        )
     
     def _extract_season_id(self, season: str) -> Optional[str]:
         """Extract season ID from season string."""
-        season_mapping = {
-            "2024/25": "317",
-            "2023/24": "281", 
-            "2022/23": "235",
-            "2021/22": "108"
-        }
-        return season_mapping.get(season)
+        return _SEASON_IDS.get(season)
     
     def _get_metric_label(self, metric_key: str) -> str:
         """Get human-readable label for a metric key."""
-        label_mapping = {
-            'touches_box_90': 'Touches in Box /90',
-            'np_xg_90': 'NP xG /90',
-            'np_xg_per_shot': 'xG / Shot',
-            'finishing_quality': 'PS xG – xG',
-            'xa_90': 'xA /90',
-            'key_passes_90': 'Key Passes /90',
-            'obv_pass_90': 'OBV Pass /90',
-            'xa_per_shot_assist': 'xA / Key Pass',
-            'deep_progressions_90': 'Deep Progressions /90',
-            'passing_ratio': 'Passing Ratio',
-            'dribble_ratio': 'Dribble Ratio',
-            'obv_dribble_carry_90': 'OBV Dribble /90',
-            'defensive_actions_90': 'Defensive Actions /90',
-            'tackles_interceptions_90': 'Tackles & Interceptions /90',
-            'aerial_ratio': 'Aerial Ratio',
-            'npxgxa_90': 'NP xG + xA /90',
-            'obv_90': 'OBV /90',
-            'positive_outcome_score': 'Positive Outcome Score'
-        }
-        
-        return label_mapping.get(metric_key, metric_key.replace('_', ' ').title())
+        label = _METRIC_LABELS.get(metric_key)
+        return label if label is not None else _fallback_metric_label(metric_key)
 
 
 def get_performance_service(season_id: str = None) -> PerformanceService:
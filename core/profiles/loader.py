@@ -4,11 +4,13 @@ Loads PCA artifacts and provides data access for striker tactical profiles.
 """
 
 import os
-import json
-import pickle
+import functools
+import orjson
 import pandas as pd
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, replace
 
 
 @dataclass
@@ -20,28 +22,255 @@ class Axis:
     pca_loadings: Optional[Dict[str, float]] = None
 
 
+# Artifacts are immutable per directory, so every loader in the process shares one copy
+_ARTIFACT_CACHE_SIZE = 16
+
+_DEFAULT_ARTIFACTS_DIR = "data/processed/striker_artifacts"
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Where to look for the striker artifacts when the requested directory doesn't exist
+_FALLBACK_ARTIFACTS_DIRS = (
+    os.path.join(_REPO_ROOT, "data", "processed", "striker_artifacts"),
+    "data/processed/striker_artifacts",
+    "../data/processed/striker_artifacts"
+)
+
+
+@functools.lru_cache(maxsize=_ARTIFACT_CACHE_SIZE)
+def _resolve_artifacts_dir(artifacts_dir: str) -> str:
+    """Return artifacts_dir if it exists, else the first existing fallback (or artifacts_dir unchanged)."""
+    if os.path.exists(artifacts_dir):
+        return artifacts_dir
+    for path in _FALLBACK_ARTIFACTS_DIRS:
+        if os.path.exists(path):
+            return path
+    return artifacts_dir
+
+
+@functools.lru_cache(maxsize=_ARTIFACT_CACHE_SIZE * 4)
+def _read_parquet_cached(artifacts_dir: str, filename: str) -> pd.DataFrame:
+    """Read a parquet artifact once per process (empty DataFrame if missing or unreadable)."""
+    path = os.path.join(artifacts_dir, filename)
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    
+    try:
+        return pd.read_parquet(path)
+    except (OSError, ValueError) as e:
+        print(f"Error loading {filename}: {e}")
+        return pd.DataFrame()
+
+
+class _ArtifactRows:
+    """Rows of a parquet artifact as plain dicts, keyed by player_season_id (the first row wins)."""
+    
+    __slots__ = ("by_player_season", "by_player")
+    
+    def __init__(self, by_player_season: Dict[str, Dict[str, Any]] = None, by_player: Dict[str, str] = None):
+        self.by_player_season = by_player_season or {}
+        # player_id prefix -> first player_season_id starting with "<player_id>_"
+        self.by_player = by_player or {}
+    
+    def __len__(self) -> int:
+        return len(self.by_player_season)
+    
+    def _key(self, player_id: str, season_id: str = None) -> Optional[str]:
+        """player_season_id of the row find() would return (None if unknown)."""
+        if season_id:
+            return f"{player_id}_{season_id}"
+        if player_id in self.by_player_season:
+            return player_id
+        return self.by_player.get(str(player_id))
+    
+    def has(self, player_id: str, season_id: str = None) -> bool:
+        """True if find() would return a row (membership checks only)."""
+        return self._key(player_id, season_id) in self.by_player_season
+    
+    def get(self, player_season_id: str) -> Optional[Dict[str, Any]]:
+        """A copy of the row for an exact player_season_id, or None."""
+        row = self.by_player_season.get(player_season_id)
+        return None if row is None else dict(row)
+    
+    def find(self, player_id: str, season_id: str = None) -> Optional[Dict[str, Any]]:
+        """Row for player_id + season_id, or for a player_season_id / the first season of player_id."""
+        return self.get(self._key(player_id, season_id))
+
+
+def _build_artifact_rows(path: str) -> _ArtifactRows:
+    """Decode a parquet artifact with pyarrow straight into row dicts (no DataFrame)."""
+    table = pq.read_table(path)
+    pandas_meta = table.schema.pandas_metadata or {}
+    index_columns = [name for name in pandas_meta.get('index_columns', []) if isinstance(name, str)]
+    if index_columns:
+        index_column = table.column(index_columns[0])
+        row_ids = index_column.to_pylist()
+        # player_season_id is normally stored as a string column; only cast other types
+        if not (pa.types.is_string(index_column.type) or pa.types.is_large_string(index_column.type)):
+            row_ids = [str(value) for value in row_ids]
+    else:
+        row_ids = [str(i) for i in range(table.num_rows)]
+    
+    # Nulls become NaN (also in string columns), like the pandas reader did
+    names = [name for name in table.column_names if name not in index_columns]
+    columns = []
+    for name in names:
+        column = table.column(name)
+        values = column.to_numpy(zero_copy_only=False).tolist()
+        if column.null_count:
+            values = [float('nan') if value is None else value for value in values]
+        columns.append(values)
+    
+    by_player_season: Dict[str, Dict[str, Any]] = {}
+    by_player: Dict[str, str] = {}
+    for player_season_id, values in zip(row_ids, zip(*columns) if columns else ((),) * len(row_ids)):
+        if player_season_id in by_player_season:
+            continue
+        by_player_season[player_season_id] = dict(zip(names, values))
+        # Every "<player_id>_" prefix of the id, as matched by startswith(player_id + '_')
+        pos = player_season_id.find('_')
+        while pos != -1:
+            by_player.setdefault(player_season_id[:pos], player_season_id)
+            pos = player_season_id.find('_', pos + 1)
+    return _ArtifactRows(by_player_season, by_player)
+
+
+@functools.lru_cache(maxsize=_ARTIFACT_CACHE_SIZE * 4)
+def _artifact_rows_cached(artifacts_dir: str, filename: str) -> _ArtifactRows:
+    """Lookup rows of a parquet artifact, built once per process (empty if missing or unreadable)."""
+    path = os.path.join(artifacts_dir, filename)
+    if not os.path.exists(path):
+        return _ArtifactRows()
+    
+    try:
+        return _build_artifact_rows(path)
+    except (OSError, ValueError) as e:
+        print(f"Error loading {filename}: {e}")
+        return _ArtifactRows()
+
+
+def _read_json(path: str, what: str) -> Any:
+    """Parse a JSON artifact (None, with a message, if it can't be read or parsed)."""
+    try:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, ValueError) as e:
+        print(f"Error loading {what}: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=_ARTIFACT_CACHE_SIZE)
+def _neighbors_by_anchor_cached(artifacts_dir: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Neighbor records grouped by anchor_player_season_id, in file order (built column-wise once)."""
+    neighbors_df = _read_parquet_cached(artifacts_dir, "player_neighbors.parquet")
+    by_anchor: Dict[str, List[Dict[str, Any]]] = {}
+    if neighbors_df.empty:
+        return by_anchor
+    
+    names = list(neighbors_df.columns)
+    columns = [neighbors_df[name].tolist() for name in names]
+    anchors = neighbors_df["anchor_player_season_id"].tolist()
+    for anchor, values in zip(anchors, zip(*columns)):
+        by_anchor.setdefault(anchor, []).append(dict(zip(names, values)))
+    return by_anchor
+
+
+@functools.lru_cache(maxsize=_ARTIFACT_CACHE_SIZE)
+def _load_axes_cached(artifacts_dir: str) -> List[Axis]:
+    """Load ability axes definitions."""
+    axes_path = os.path.join(artifacts_dir, "ability_axes.json")
+    if not os.path.exists(axes_path):
+        # Fallback to hardcoded axes from notebook
+        return [
+            Axis("Progressive_Play", "Progressive Play", "Ball progression & link play",
+                 pca_loadings={
+                     "PC1": "+0.439 (carries)",
+                     "PC2": "-0.216 (passing ratio)",
+                     "PC3": "-0.221 (passing ratio)"
+                 }),
+            Axis("Finishing_BoxPresence", "Finishing & Box Presence", "Goal scoring and box positioning",
+                 pca_loadings={
+                     "PC1": "-0.194 (inverse)",
+                     "PC2": "-0.186 (inverse)",
+                     "PC3": "+0.477 (touches in box)"
+                 }),
+            Axis("Pressing_WorkRate", "Pressing Work Rate", "Defensive pressure and work rate",
+                 pca_loadings={
+                     "PC1": "+0.037 (minimal)",
+                     "PC2": "+0.556 (pressures)",
+                     "PC3": "+0.014 (minimal)"
+                 }),
+            Axis("Finishing_Efficiency", "Finishing Efficiency", "Shot conversion and efficiency",
+                 pca_loadings={
+                     "PC1": "-0.213 (inverse)",
+                     "PC2": "-0.212 (inverse)",
+                     "PC3": "+0.452 (shot accuracy)"
+                 }),
+            Axis("Dribbling_RiskTaking", "Dribbling & Risk-Taking", "Ball carrying and risk taking",
+                 pca_loadings={
+                     "PC1": "+0.390 (dribbles)",
+                     "PC2": "+0.354 (tackles)",
+                     "PC3": "-0.221 (passing)"
+                 }),
+            Axis("DecisionMaking_Balance", "Decision Making & Balance", "Decision making and balance",
+                 pca_loadings={
+                     "PC1": "+0.439 (carries)",
+                     "PC2": "+0.521 (pressure regains)",
+                     "PC3": "-0.011 (balanced)"
+                 })
+        ]
+    
+    axes_data = _read_json(axes_path, "axes")
+    return [Axis(**axis) for axis in axes_data] if axes_data is not None else []
+
+
+@functools.lru_cache(maxsize=_ARTIFACT_CACHE_SIZE)
+def _load_league_reference_cached(artifacts_dir: str) -> Dict[str, float]:
+    """Load league reference data."""
+    ref_path = os.path.join(artifacts_dir, "league_reference.json")
+    if not os.path.exists(ref_path):
+        # Default league average (50th percentile for all axes)
+        return {
+            "Progressive_Play": 50.0,
+            "Finishing_BoxPresence": 50.0,
+            "Pressing_WorkRate": 50.0,
+            "Finishing_Efficiency": 50.0,
+            "Dribbling_RiskTaking": 50.0,
+            "DecisionMaking_Balance": 50.0
+        }
+    
+    reference = _read_json(ref_path, "league reference")
+    return reference if reference is not None else {}
+
+
+@functools.lru_cache(maxsize=_ARTIFACT_CACHE_SIZE)
+def _load_axis_ranges_cached(artifacts_dir: str) -> Dict[str, Dict[str, float]]:
+    """Load axis ranges for absolute mode rendering."""
+    ranges_path = os.path.join(artifacts_dir, "axis_ranges.json")
+    if not os.path.exists(ranges_path):
+        # Default ranges based on normalized scores (0-1)
+        return {
+            "Progressive_Play": {"min": 0.0, "max": 1.0},
+            "Finishing_BoxPresence": {"min": 0.0, "max": 1.0},
+            "Pressing_WorkRate": {"min": 0.0, "max": 1.0},
+            "Finishing_Efficiency": {"min": 0.0, "max": 1.0},
+            "Dribbling_RiskTaking": {"min": 0.0, "max": 1.0},
+            "DecisionMaking_Balance": {"min": 0.0, "max": 1.0}
+        }
+    
+    ranges = _read_json(ranges_path, "axis ranges")
+    return ranges if ranges is not None else {}
+
+
 class TacticalProfileLoader:
     """Loads and caches tactical profile artifacts."""
     
-    def __init__(self, artifacts_dir: str = "data/processed/striker_artifacts"):
+    def __init__(self, artifacts_dir: str = _DEFAULT_ARTIFACTS_DIR):
         """Initialize the loader with artifacts directory."""
-        # Use absolute path if relative path doesn't exist
-        if not os.path.exists(artifacts_dir):
-            # Try to find the correct path
-            possible_paths = [
-                "C:/Users/carls/OneDrive/Dokumente/Uni/05 Semester/Marketing y Estrategia de Deportes/Projekt/Repo/ISAC2025/data/processed/striker_artifacts",
-                "data/processed/striker_artifacts",
-                "../data/processed/striker_artifacts"
-            ]
-            for path in possible_paths:
-                if os.path.exists(path):
-                    artifacts_dir = path
-                    break
-        
-        self.artifacts_dir = artifacts_dir
+        # Fall back to the striker artifacts if the directory doesn't exist (resolved once per directory)
+        self.artifacts_dir = _resolve_artifacts_dir(artifacts_dir)
         self._axes: Optional[List[Axis]] = None
-        self._ability_scores: Optional[pd.DataFrame] = None
-        self._percentiles: Optional[pd.DataFrame] = None
+        self._ability_scores: Optional[_ArtifactRows] = None
+        self._percentiles: Optional[_ArtifactRows] = None
         self._league_reference: Optional[Dict[str, float]] = None
         self._axis_ranges: Optional[Dict[str, Dict[str, float]]] = None
         self._neighbors_df: Optional[pd.DataFrame] = None
@@ -61,82 +290,21 @@ class TacticalProfileLoader:
     
     def _load_axes(self):
         """Load ability axes definitions."""
-        try:
-            axes_path = os.path.join(self.artifacts_dir, "ability_axes.json")
-            if os.path.exists(axes_path):
-                with open(axes_path, 'r') as f:
-                    axes_data = json.load(f)
-                self._axes = [Axis(**axis) for axis in axes_data]
-            else:
-                # Fallback to hardcoded axes from notebook
-                self._axes = [
-                    Axis("Progressive_Play", "Progressive Play", "Ball progression & link play",
-                         pca_loadings={
-                             "PC1": "+0.439 (carries)",
-                             "PC2": "-0.216 (passing ratio)",
-                             "PC3": "-0.221 (passing ratio)"
-                         }),
-                    Axis("Finishing_BoxPresence", "Finishing & Box Presence", "Goal scoring and box positioning",
-                         pca_loadings={
-                             "PC1": "-0.194 (inverse)",
-                             "PC2": "-0.186 (inverse)",
-                             "PC3": "+0.477 (touches in box)"
-                         }),
-                    Axis("Pressing_WorkRate", "Pressing Work Rate", "Defensive pressure and work rate",
-                         pca_loadings={
-                             "PC1": "+0.037 (minimal)",
-                             "PC2": "+0.556 (pressures)",
-                             "PC3": "+0.014 (minimal)"
-                         }),
-                    Axis("Finishing_Efficiency", "Finishing Efficiency", "Shot conversion and efficiency",
-                         pca_loadings={
-                             "PC1": "-0.213 (inverse)",
-                             "PC2": "-0.212 (inverse)",
-                             "PC3": "+0.452 (shot accuracy)"
-                         }),
-                    Axis("Dribbling_RiskTaking", "Dribbling & Risk-Taking", "Ball carrying and risk taking",
-                         pca_loadings={
-                             "PC1": "+0.390 (dribbles)",
-                             "PC2": "+0.354 (tackles)",
-                             "PC3": "-0.221 (passing)"
-                         }),
-                    Axis("DecisionMaking_Balance", "Decision Making & Balance", "Decision making and balance",
-                         pca_loadings={
-                             "PC1": "+0.439 (carries)",
-                             "PC2": "+0.521 (pressure regains)",
-                             "PC3": "-0.011 (balanced)"
-                         })
-                ]
-        except Exception as e:
-            print(f"Error loading axes: {e}")
-            self._axes = []
+        self._axes = _load_axes_cached(self.artifacts_dir)
     
     def _load_ability_scores(self):
         """Load ability scores data (raw PC scores)."""
-        try:
-            scores_path = os.path.join(self.artifacts_dir, "ability_scores.parquet")
-            if os.path.exists(scores_path):
-                self._ability_scores = pd.read_parquet(scores_path)
-            else:
-                # Create empty DataFrame with expected structure
-                self._ability_scores = pd.DataFrame()
-        except Exception as e:
-            print(f"Error loading ability scores: {e}")
-            self._ability_scores = pd.DataFrame()
+        self._ability_scores = _artifact_rows_cached(self.artifacts_dir, "ability_scores.parquet")
     
     def get_ability_scores_zscore(self, player_id: str, season_id: str = None) -> Optional[Dict[str, float]]:
         """Get Z-score normalized ability scores for a specific player and season."""
         try:
-            zscore_path = os.path.join(self.artifacts_dir, "ability_scores_zscore.parquet")
-            if not os.path.exists(zscore_path):
+            zscore_rows = _artifact_rows_cached(self.artifacts_dir, "ability_scores_zscore.parquet")
+            if not zscore_rows:
                 return None
             
-            zscore_df = pd.read_parquet(zscore_path)
-            
             if season_id:
-                player_season_id = f"{player_id}_{season_id}"
-                if player_season_id in zscore_df.index:
-                    return zscore_df.loc[player_season_id].to_dict()
+                return zscore_rows.find(player_id, season_id)
             
             return None
         except Exception as e:
@@ -146,16 +314,12 @@ class TacticalProfileLoader:
     def get_ability_scores_l2(self, player_id: str, season_id: str = None) -> Optional[Dict[str, float]]:
         """Get L2-normalized ability scores for a specific player and season."""
         try:
-            l2_path = os.path.join(self.artifacts_dir, "ability_scores_l2.parquet")
-            if not os.path.exists(l2_path):
+            l2_rows = _artifact_rows_cached(self.artifacts_dir, "ability_scores_l2.parquet")
+            if not l2_rows:
                 return None
             
-            l2_df = pd.read_parquet(l2_path)
-            
             if season_id:
-                player_season_id = f"{player_id}_{season_id}"
-                if player_season_id in l2_df.index:
-                    return l2_df.loc[player_season_id].to_dict()
+                return l2_rows.find(player_id, season_id)
             
             return None
         except Exception as e:
@@ -164,94 +328,34 @@ class TacticalProfileLoader:
     
     def _load_percentiles(self):
         """Load percentile data."""
-        try:
-            percentiles_path = os.path.join(self.artifacts_dir, "ability_percentiles.parquet")
-            if os.path.exists(percentiles_path):
-                self._percentiles = pd.read_parquet(percentiles_path)
-            else:
-                # Create empty DataFrame with expected structure
-                self._percentiles = pd.DataFrame()
-        except Exception as e:
-            print(f"Error loading percentiles: {e}")
-            self._percentiles = pd.DataFrame()
+        self._percentiles = _artifact_rows_cached(self.artifacts_dir, "ability_percentiles.parquet")
     
     def _load_league_reference(self):
         """Load league reference data."""
-        try:
-            ref_path = os.path.join(self.artifacts_dir, "league_reference.json")
-            if os.path.exists(ref_path):
-                with open(ref_path, 'r') as f:
-                    self._league_reference = json.load(f)
-            else:
-                # Default league average (50th percentile for all axes)
-                self._league_reference = {
-                    "Progressive_Play": 50.0,
-                    "Finishing_BoxPresence": 50.0,
-                    "Pressing_WorkRate": 50.0,
-                    "Finishing_Efficiency": 50.0,
-                    "Dribbling_RiskTaking": 50.0,
-                    "DecisionMaking_Balance": 50.0
-                }
-        except Exception as e:
-            print(f"Error loading league reference: {e}")
-            self._league_reference = {}
+        self._league_reference = _load_league_reference_cached(self.artifacts_dir)
     
     def _load_axis_ranges(self):
         """Load axis ranges for absolute mode rendering."""
-        try:
-            ranges_path = os.path.join(self.artifacts_dir, "axis_ranges.json")
-            if os.path.exists(ranges_path):
-                with open(ranges_path, 'r') as f:
-                    self._axis_ranges = json.load(f)
-            else:
-                # Default ranges based on normalized scores (0-1)
-                self._axis_ranges = {
-                    "Progressive_Play": {"min": 0.0, "max": 1.0},
-                    "Finishing_BoxPresence": {"min": 0.0, "max": 1.0},
-                    "Pressing_WorkRate": {"min": 0.0, "max": 1.0},
-                    "Finishing_Efficiency": {"min": 0.0, "max": 1.0},
-                    "Dribbling_RiskTaking": {"min": 0.0, "max": 1.0},
-                    "DecisionMaking_Balance": {"min": 0.0, "max": 1.0}
-                }
-        except Exception as e:
-            print(f"Error loading axis ranges: {e}")
-            self._axis_ranges = {}
+        self._axis_ranges = _load_axis_ranges_cached(self.artifacts_dir)
     
     def get_axes(self) -> List[Axis]:
-        """Get the ability axes definitions."""
+        """Get the ability axes definitions (copies; the cached axes are shared by every loader)."""
         self._load_artifacts_if_needed()
-        return self._axes or []
+        return [
+            replace(axis, pca_loadings=dict(axis.pca_loadings) if axis.pca_loadings is not None else None)
+            for axis in self._axes or []
+        ]
     
     def get_player_ability_scores(self, player_id: str, season_id: str = None) -> Optional[Dict[str, float]]:
         """Get ability scores for a specific player and season."""
         self._load_artifacts_if_needed()
         
-        if self._ability_scores.empty:
+        if not self._ability_scores:
             return None
             
         try:
             # Try to find player by player_season_id or player_id
-            player_data = None
-            
-            if season_id:
-                # Look for specific player_season_id
-                player_season_id = f"{player_id}_{season_id}"
-                if player_season_id in self._ability_scores.index:
-                    player_data = self._ability_scores.loc[player_season_id]
-            else:
-                # First try player_season_id format
-                if player_id in self._ability_scores.index:
-                    player_data = self._ability_scores.loc[player_id]
-                else:
-                    # Try to find by extracting player_id from player_season_id
-                    for idx in self._ability_scores.index:
-                        if str(idx).startswith(str(player_id) + '_'):
-                            player_data = self._ability_scores.loc[idx]
-                            break
-            
-            if player_data is not None:
-                return player_data.to_dict()
-            return None
+            return self._ability_scores.find(player_id, season_id)
         except Exception as e:
             print(f"Error getting ability scores for player {player_id} season {season_id}: {e}")
             return None
@@ -260,57 +364,73 @@ class TacticalProfileLoader:
         """Get percentile scores for a specific player and season."""
         self._load_artifacts_if_needed()
         
-        if self._percentiles.empty:
+        if not self._percentiles:
             return None
             
         try:
             # Try to find player by player_season_id or player_id
-            player_data = None
-            
-            if season_id:
-                # Look for specific player_season_id
-                player_season_id = f"{player_id}_{season_id}"
-                if player_season_id in self._percentiles.index:
-                    player_data = self._percentiles.loc[player_season_id]
-            else:
-                # First try player_season_id format
-                if player_id in self._percentiles.index:
-                    player_data = self._percentiles.loc[player_id]
-                else:
-                    # Try to find by extracting player_id from player_season_id
-                    for idx in self._percentiles.index:
-                        if str(idx).startswith(str(player_id) + '_'):
-                            player_data = self._percentiles.loc[idx]
-                            break
-            
-            if player_data is not None:
-                return player_data.to_dict()
-            return None
+            return self._percentiles.find(player_id, season_id)
         except Exception as e:
             print(f"Error getting percentiles for player {player_id} season {season_id}: {e}")
             return None
     
+    def get_player_bundle(
+        self, player_id: str, season_id: str = None
+    ) -> Tuple[Optional[Dict[str, float]], Optional[Dict[str, float]]]:
+        """Get (ability scores, percentiles) for a player and season in one call."""
+        self._load_artifacts_if_needed()
+        return self._ability_scores.find(player_id, season_id), self._percentiles.find(player_id, season_id)
+    
+    def get_player_artifacts(self, player_id: str, season_id: str = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get all per-player rows for a player and season in one call.
+        
+        Returns:
+            Dict with ability_scores, percentiles, ability_scores_zscore and ability_scores_l2
+            (same values as the individual getters; the normalized rows need a season_id)
+        """
+        self._load_artifacts_if_needed()
+        if not season_id:
+            return {
+                "ability_scores": self._ability_scores.find(player_id),
+                "percentiles": self._percentiles.find(player_id),
+                "ability_scores_zscore": None,
+                "ability_scores_l2": None
+            }
+        
+        # One player_season_id for every artifact
+        player_season_id = f"{player_id}_{season_id}"
+        return {
+            "ability_scores": self._ability_scores.get(player_season_id),
+            "percentiles": self._percentiles.get(player_season_id),
+            "ability_scores_zscore": _artifact_rows_cached(
+                self.artifacts_dir, "ability_scores_zscore.parquet"
+            ).get(player_season_id),
+            "ability_scores_l2": _artifact_rows_cached(
+                self.artifacts_dir, "ability_scores_l2.parquet"
+            ).get(player_season_id)
+        }
+    
+    def has_player(self, player_id: str, season_id: str = None) -> bool:
+        """Check if the player (and season) has ability scores or percentiles, without copying rows."""
+        self._load_artifacts_if_needed()
+        return self._ability_scores.has(player_id, season_id) or self._percentiles.has(player_id, season_id)
+    
     def get_league_reference(self) -> Optional[Dict[str, float]]:
-        """Get league reference scores."""
+        """Get league reference scores (a copy of the shared cached dict)."""
         self._load_artifacts_if_needed()
-        return self._league_reference
+        return dict(self._league_reference) if self._league_reference is not None else None
     
     def get_axis_ranges(self) -> Optional[Dict[str, Dict[str, float]]]:
-        """Get axis ranges for absolute mode rendering."""
+        """Get axis ranges for absolute mode rendering (a copy of the shared cached dict)."""
         self._load_artifacts_if_needed()
-        return self._axis_ranges
+        if self._axis_ranges is None:
+            return None
+        return {key: dict(bounds) for key, bounds in self._axis_ranges.items()}
     
     def _load_neighbors(self) -> None:
         """Load neighbor similarity data."""
-        try:
-            neighbors_path = os.path.join(self.artifacts_dir, "player_neighbors.parquet")
-            if os.path.exists(neighbors_path):
-                self._neighbors_df = pd.read_parquet(neighbors_path)
-            else:
-                self._neighbors_df = pd.DataFrame()
-        except Exception as e:
-            print(f"Error loading neighbors: {e}")
-            self._neighbors_df = pd.DataFrame()
+        self._neighbors_df = _read_parquet_cached(self.artifacts_dir, "player_neighbors.parquet")
     
     def get_neighbors(self, player_season_id: str, top_k: int = 5) -> List[Dict]:
         """
@@ -330,24 +450,16 @@ class TacticalProfileLoader:
             return []
         
         try:
-            # Filter for this anchor player and get top K
-            neighbors = self._neighbors_df[
-                self._neighbors_df["anchor_player_season_id"] == player_season_id
-            ].head(top_k)
-            
-            return neighbors.to_dict('records')
+            # Grouped by anchor once per directory; copy the top K records
+            neighbors = _neighbors_by_anchor_cached(self.artifacts_dir).get(player_season_id, [])
+            return [dict(neighbor) for neighbor in neighbors[:top_k]]
         except Exception as e:
             print(f"Error getting neighbors for player {player_season_id}: {e}")
             return []
 
 
 # Global loader instance
-_loader_instance: Optional[TacticalProfileLoader] = None
-
-
+@functools.cache
 def get_loader() -> TacticalProfileLoader:
     """Get the global loader instance."""
-    global _loader_instance
-    if _loader_instance is None:
-        _loader_instance = TacticalProfileLoader()
-    return _loader_instance
+    return TacticalProfileLoader()
@@ -4,9 +4,139 @@ Builds striker profile payloads for the UI.
 """
 
 import os
+import types
+import functools
 from typing import Dict, Optional, Any, List
 from .loader import get_loader, TacticalProfileLoader
 
+# Striker position mappings
+_STRIKER_POSITIONS = frozenset({
+    'Centre Forward',
+    'Left Centre Forward',
+    'Right Centre Forward'
+})
+
+# Deep Progression Unit position mappings (Full-backs + Midfielders)
+_DEEP_PROGRESSION_POSITIONS = frozenset({
+    # Full-backs / Wing-backs
+    'Left Back',
+    'Right Back',
+    'Left Wing Back',
+    'Right Wing Back',
+    # Defensive Midfielders
+    'Centre Defensive Midfielder',
+    'Left Defensive Midfielder',
+    'Right Defensive Midfielder',
+    # Central Midfielders
+    'Centre Midfielder',
+    'Left Centre Midfielder',
+    'Right Centre Midfielder'
+})
+
+# Attacking Midfielders & Wingers position mappings
+_ATTACKING_MID_WINGER_POSITIONS = frozenset({
+    # Wide Midfielders
+    'Right Midfielder',
+    'Left Midfielder',
+    # Wingers
+    'Right Wing',
+    'Left Wing',
+    # Attacking Midfielders
+    'Right Attacking Midfielder',
+    'Centre Attacking Midfielder',
+    'Left Attacking Midfielder'
+})
+
+# Center Back position mappings
+_CENTER_BACK_POSITIONS = frozenset({
+    'Centre Back',
+    'Left Centre Back',
+    'Right Centre Back'
+})
+
+# Artifacts directory of the Deep Progression Unit profiles
+_DEEP_PROGRESSION_ARTIFACTS_DIR = "data/processed/deep_progression_artifacts"
+
+# Season string -> StatsBomb season ID
+_SEASON_IDS = types.MappingProxyType({
+    "2024/25": "317",
+    "2023/24": "281",
+    "2022/23": "235",
+    "2021/22": "108"
+})
+
+@functools.lru_cache(maxsize=256)
+def _format_position(primary_position: Optional[str], secondary_position: Optional[str]) -> str:
+    """Format position display string."""
+    if not primary_position:
+        return "Striker"
+    
+    if secondary_position and secondary_position != primary_position:
+        return f"{primary_position} / {secondary_position}"
+    else:
+        return primary_position
+
+
+@functools.lru_cache(maxsize=256)
+def _position_group(primary_position: str, secondary_position: Optional[str]) -> Optional[str]:
+    """Position group for a (primary, secondary) pair; the first matching group wins."""
+    if primary_position in _STRIKER_POSITIONS or secondary_position in _STRIKER_POSITIONS:
+        return "striker"
+    elif primary_position in _DEEP_PROGRESSION_POSITIONS:
+        return "deep_progression"
+    elif primary_position in _ATTACKING_MID_WINGER_POSITIONS or secondary_position in _ATTACKING_MID_WINGER_POSITIONS:
+        return "attacking_mid_winger"
+    elif primary_position in _CENTER_BACK_POSITIONS or secondary_position in _CENTER_BACK_POSITIONS:
+        return "center_back"
+    return None
+
+
+def _profile_stats(minutes: int, appearances: int, goals: int, assists: int, foot: str, age: str) -> Dict[str, Any]:
+    """Additional stats section shared by every profile payload."""
+    return {
+        "minutes": minutes,
+        "appearances": appearances,
+        "goals": goals,
+        "assists": assists,
+        "foot": foot,
+        "age": age
+    }
+
+
+# Constant profile meta per position group (copied into each payload)
+_META_STRIKER = types.MappingProxyType({
+    "data_version": "v1",
+    "computed_at": "2025-10-21",
+    "is_striker": True
+})
+_META_DEEP_PROGRESSION = types.MappingProxyType({
+    "data_version": "v1",
+    "computed_at": "2025-10-23",
+    "is_deep_progression": True,
+    "position_group": "deep_progression"
+})
+_META_ATTACKING_MID_WINGER = types.MappingProxyType({
+    "data_version": "v1",
+    "computed_at": "2025-10-23",
+    "is_attacking_mid_winger": True,
+    "position_group": "attacking_mid_winger"
+})
+_META_CENTER_BACK = types.MappingProxyType({
+    "data_version": "v1",
+    "computed_at": "2025-01-23",
+    "is_center_back": True,
+    "position_group": "center_back"
+})
+# Meta of the simplified historical profiles (player evolution), per position group
+_META_HISTORICAL = types.MappingProxyType({
+    position_group: types.MappingProxyType({
+        "data_version": "v1",
+        "position_group": position_group,
+        "is_historical": True
+    })
+    for position_group in ("striker", "deep_progression", "attacking_mid_winger", "center_back")
+})
+
 
 class TacticalProfileService:
     """Service for building tactical profile payloads."""
@@ -15,82 +145,40 @@ class TacticalProfileService:
         """Initialize the service with a loader."""
         self.loader = loader or get_loader()
         self._player_cache: Dict[str, Dict[str, Any]] = {}  # Cache for player metadata
+        self._dp_loader: Optional[TacticalProfileLoader] = None  # Created on first Deep Progression request
         
-        # Striker position mappings
-        self.striker_positions = {
-            'Centre Forward',
-            'Left Centre Forward', 
-            'Right Centre Forward'
-        }
-        
-        # Deep Progression Unit position mappings (Full-backs + Midfielders)
-        self.deep_progression_positions = {
-            # Full-backs / Wing-backs
-            'Left Back',
-            'Right Back', 
-            'Left Wing Back',
-            'Right Wing Back',
-            # Defensive Midfielders
-            'Centre Defensive Midfielder',
-            'Left Defensive Midfielder',
-            'Right Defensive Midfielder',
-            # Central Midfielders
-            'Centre Midfielder',
-            'Left Centre Midfielder',
-            'Right Centre Midfielder'
-        }
-        
-        # Attacking Midfielders & Wingers position mappings
-        self.attacking_mid_winger_positions = {
-            # Wide Midfielders
-            'Right Midfielder',
-            'Left Midfielder',
-            # Wingers
-            'Right Wing',
-            'Left Wing',
-            # Attacking Midfielders
-            'Right Attacking Midfielder',
-            'Centre Attacking Midfielder',
-            'Left Attacking Midfielder'
-        }
-        
-        # Center Back position mappings
-        self.center_back_positions = {
-            'Centre Back',
-            'Left Centre Back',
-            'Right Centre Back'
-        }
+        # Position group mappings (shared module-level frozensets)
+        self.striker_positions = _STRIKER_POSITIONS
+        self.deep_progression_positions = _DEEP_PROGRESSION_POSITIONS
+        self.attacking_mid_winger_positions = _ATTACKING_MID_WINGER_POSITIONS
+        self.center_back_positions = _CENTER_BACK_POSITIONS
+    
+    def _get_dp_loader(self) -> TacticalProfileLoader:
+        """Get the Deep Progression loader, created once per service."""
+        if self._dp_loader is None:
+            self._dp_loader = TacticalProfileLoader(artifacts_dir=_DEEP_PROGRESSION_ARTIFACTS_DIR)
+        return self._dp_loader
     
     def is_striker(self, primary_position: str, secondary_position: Optional[str] = None) -> bool:
         """Check if a player is a striker based on position."""
-        return (primary_position in self.striker_positions or 
-                (secondary_position and secondary_position in self.striker_positions))
+        # None is never a member, so no short-circuit is needed for a missing secondary
+        return primary_position in _STRIKER_POSITIONS or secondary_position in _STRIKER_POSITIONS
     
     def is_deep_progression(self, primary_position: str, secondary_position: Optional[str] = None) -> bool:
         """Check if a player is part of the Deep Progression Unit based on position."""
-        return primary_position in self.deep_progression_positions
+        return primary_position in _DEEP_PROGRESSION_POSITIONS
     
     def is_attacking_mid_winger(self, primary_position: str, secondary_position: Optional[str] = None) -> bool:
         """Check if a player is an Attacking Midfielder or Winger based on position."""
-        return (primary_position in self.attacking_mid_winger_positions or 
-                (secondary_position and secondary_position in self.attacking_mid_winger_positions))
+        return primary_position in _ATTACKING_MID_WINGER_POSITIONS or secondary_position in _ATTACKING_MID_WINGER_POSITIONS
     
     def is_center_back(self, primary_position: str, secondary_position: Optional[str] = None) -> bool:
         """Check if a player is a Center Back based on position."""
-        return (primary_position in self.center_back_positions or 
-                (secondary_position and secondary_position in self.center_back_positions))
+        return primary_position in _CENTER_BACK_POSITIONS or secondary_position in _CENTER_BACK_POSITIONS
     
     def get_position_group(self, primary_position: str, secondary_position: Optional[str] = None) -> Optional[str]:
-        """Determine which position group a player belongs to."""
-        if self.is_striker(primary_position, secondary_position):
-            return "striker"
-        elif self.is_deep_progression(primary_position, secondary_position):
-            return "deep_progression"
-        elif self.is_attacking_mid_winger(primary_position, secondary_position):
-            return "attacking_mid_winger"
-        elif self.is_center_back(primary_position, secondary_position):
-            return "center_back"
-        return None
+        """Determine which position group a player belongs to (memoized per position pair)."""
+        return _position_group(primary_position, secondary_position)
     
     def build_striker_profile(
         self, 
@@ -126,10 +214,34 @@ class TacticalProfileService:
         if primary_position and not self.is_striker(primary_position, secondary_position):
             return None
         
-        # Get ability scores and percentiles for the specific season
+        return self._build_striker_profile(
+            player_id, player_name, team_name, primary_position, secondary_position, season,
+            minutes, appearances, goals, assists, foot, age
+        )
+    
+    def _build_striker_profile(
+        self,
+        player_id: str,
+        player_name: Optional[str],
+        team_name: Optional[str],
+        primary_position: Optional[str],
+        secondary_position: Optional[str],
+        season: str,
+        minutes: int,
+        appearances: int,
+        goals: int,
+        assists: int,
+        foot: str,
+        age: str
+    ) -> Optional[Dict[str, Any]]:
+        """Build the striker profile payload (position already checked)."""
+        # Unknown players skip the row lookups entirely
         season_id = self._extract_season_id(season)
-        ability_scores = self.loader.get_player_ability_scores(player_id, season_id)
-        percentiles = self.loader.get_player_percentiles(player_id, season_id)
+        if not self.loader.has_player(player_id, season_id):
+            return None
+        
+        # Get ability scores and percentiles for the specific season
+        ability_scores, percentiles = self.loader.get_player_bundle(player_id, season_id)
         
         # If no data found, return None
         if not ability_scores and not percentiles:
@@ -149,19 +261,8 @@ class TacticalProfileService:
             "percentiles": percentiles or {},
             "league_reference": league_reference or {},
             # Additional stats
-            "stats": {
-                "minutes": minutes,
-                "appearances": appearances,
-                "goals": goals,
-                "assists": assists,
-                "foot": foot,
-                "age": age
-            },
-            "meta": {
-                "data_version": "v1",
-                "computed_at": "2025-10-21",
-                "is_striker": True
-            }
+            "stats": _profile_stats(minutes, appearances, goals, assists, foot, age),
+            "meta": dict(_META_STRIKER)
         }
         
         return profile
@@ -200,16 +301,37 @@ class TacticalProfileService:
         if primary_position and not self.is_deep_progression(primary_position, secondary_position):
             return None
         
+        return self._build_deep_progression_profile(
+            player_id, player_name, team_name, primary_position, secondary_position, season,
+            minutes, appearances, goals, assists, foot, age
+        )
+    
+    def _build_deep_progression_profile(
+        self,
+        player_id: str,
+        player_name: Optional[str],
+        team_name: Optional[str],
+        primary_position: Optional[str],
+        secondary_position: Optional[str],
+        season: str,
+        minutes: int,
+        appearances: int,
+        goals: int,
+        assists: int,
+        foot: str,
+        age: str
+    ) -> Optional[Dict[str, Any]]:
+        """Build the Deep Progression Unit profile payload (position already checked)."""
         # Get loader for Deep Progression artifacts
-        from .loader import TacticalProfileLoader
-        dp_loader = TacticalProfileLoader(artifacts_dir="data/processed/deep_progression_artifacts")
+        dp_loader = self._get_dp_loader()
         
         # Get ability scores and percentiles for the specific season
         season_id = self._extract_season_id(season)
-        ability_scores = dp_loader.get_player_ability_scores(player_id, season_id)
-        percentiles = dp_loader.get_player_percentiles(player_id, season_id)
-        ability_scores_zscore = dp_loader.get_ability_scores_zscore(player_id, season_id)
-        ability_scores_l2 = dp_loader.get_ability_scores_l2(player_id, season_id)
+        artifacts = dp_loader.get_player_artifacts(player_id, season_id)
+        ability_scores = artifacts["ability_scores"]
+        percentiles = artifacts["percentiles"]
+        ability_scores_zscore = artifacts["ability_scores_zscore"]
+        ability_scores_l2 = artifacts["ability_scores_l2"]
         
         # If no data found, return None
         if not ability_scores and not percentiles:
@@ -231,20 +353,8 @@ class TacticalProfileService:
             "percentiles": percentiles or {},
             "league_reference": league_reference or {},
             # Additional stats
-            "stats": {
-                "minutes": minutes,
-                "appearances": appearances,
-                "goals": goals,
-                "assists": assists,
-                "foot": foot,
-                "age": age
-            },
-            "meta": {
-                "data_version": "v1",
-                "computed_at": "2025-10-23",
-                "is_deep_progression": True,
-                "position_group": "deep_progression"
-            }
+            "stats": _profile_stats(minutes, appearances, goals, assists, foot, age),
+            "meta": dict(_META_DEEP_PROGRESSION)
         }
         
         return profile
@@ -283,6 +393,27 @@ class TacticalProfileService:
         if primary_position and not self.is_attacking_mid_winger(primary_position, secondary_position):
             return None
         
+        return self._build_attacking_mid_winger_profile(
+            player_id, player_name, team_name, primary_position, secondary_position, season,
+            minutes, appearances, goals, assists, foot, age
+        )
+    
+    def _build_attacking_mid_winger_profile(
+        self,
+        player_id: str,
+        player_name: Optional[str],
+        team_name: Optional[str],
+        primary_position: Optional[str],
+        secondary_position: Optional[str],
+        season: str,
+        minutes: int,
+        appearances: int,
+        goals: int,
+        assists: int,
+        foot: str,
+        age: str
+    ) -> Optional[Dict[str, Any]]:
+        """Build the Attacking Midfielders & Wingers profile payload (position already checked)."""
         # Get loader for AM/W artifacts
         from .loader import TacticalProfileLoader
         amw_loader = TacticalProfileLoader(artifacts_dir="data/processed/attacking_midfielders_wingers_artifacts")
@@ -314,20 +445,8 @@ class TacticalProfileService:
             "percentiles": percentiles or {},
             "league_reference": league_reference or {},
             # Additional stats
-            "stats": {
-                "minutes": minutes,
-                "appearances": appearances,
-                "goals": goals,
-                "assists": assists,
-                "foot": foot,
-                "age": age
-            },
-            "meta": {
-                "data_version": "v1",
-                "computed_at": "2025-10-23",
-                "is_attacking_mid_winger": True,
-                "position_group": "attacking_mid_winger"
-            }
+            "stats": _profile_stats(minutes, appearances, goals, assists, foot, age),
+            "meta": dict(_META_ATTACKING_MID_WINGER)
         }
         
         return profile
@@ -422,20 +541,8 @@ class TacticalProfileService:
                 }
                 for axis in axes
             ],
-            "stats": {
-                "minutes": minutes,
-                "appearances": appearances,
-                "goals": goals,
-                "assists": assists,
-                "foot": foot,
-                "age": age
-            },
-            "meta": {
-                "data_version": "v1",
-                "computed_at": "2025-01-23",
-                "is_center_back": True,
-                "position_group": "center_back"
-            }
+            "stats": _profile_stats(minutes, appearances, goals, assists, foot, age),
+            "meta": dict(_META_CENTER_BACK)
         }
         
         return profile
@@ -461,103 +568,38 @@ class TacticalProfileService:
         Returns:
             Profile payload dict or None if player not found
         """
-        # Try striker first
-        if self.is_striker(primary_position, secondary_position):
-            return self.build_striker_profile(
-                player_id=player_id,
-                player_name=player_name,
-                team_name=team_name,
-                primary_position=primary_position,
-                secondary_position=secondary_position,
-                season=season,
-                minutes=minutes,
-                appearances=appearances,
-                goals=goals,
-                assists=assists,
-                foot=foot,
-                age=age
-            )
-        
-        # Try Deep Progression Unit
-        if self.is_deep_progression(primary_position, secondary_position):
-            return self.build_deep_progression_profile(
-                player_id=player_id,
-                player_name=player_name,
-                team_name=team_name,
-                primary_position=primary_position,
-                secondary_position=secondary_position,
-                season=season,
-                minutes=minutes,
-                appearances=appearances,
-                goals=goals,
-                assists=assists,
-                foot=foot,
-                age=age
-            )
-        
-        # Try Attacking Midfielders & Wingers
-        if self.is_attacking_mid_winger(primary_position, secondary_position):
-            return self.build_attacking_mid_winger_profile(
-                player_id=player_id,
-                player_name=player_name,
-                team_name=team_name,
-                primary_position=primary_position,
-                secondary_position=secondary_position,
-                season=season,
-                minutes=minutes,
-                appearances=appearances,
-                goals=goals,
-                assists=assists,
-                foot=foot,
-                age=age
-            )
-        
-        # Try Center Backs
-        if self.is_center_back(primary_position, secondary_position):
-            return self.build_center_back_profile(
-                player_id=player_id,
-                player_name=player_name,
-                team_name=team_name,
-                primary_position=primary_position,
-                secondary_position=secondary_position,
-                season=season,
-                minutes=minutes,
-                appearances=appearances,
-                goals=goals,
-                assists=assists,
-                foot=foot,
-                age=age
-            )
-        
-        return None
+        # Position group is resolved once; the inner builders skip the group's own check
+        position_group = self.get_position_group(primary_position, secondary_position)
+        if position_group == "striker":
+            build = self._build_striker_profile
+        elif position_group == "deep_progression":
+            build = self._build_deep_progression_profile
+        elif position_group == "attacking_mid_winger":
+            build = self._build_attacking_mid_winger_profile
+        elif position_group == "center_back":
+            build = self.build_center_back_profile
+        else:
+            return None
+        
+        return build(
+            player_id, player_name, team_name, primary_position, secondary_position, season,
+            minutes, appearances, goals, assists, foot, age
+        )
     
     def _format_position(self, primary_position: Optional[str], secondary_position: Optional[str]) -> str:
         """Format position display string."""
-        if not primary_position:
-            return "Striker"
-        
-        if secondary_position and secondary_position != primary_position:
-            return f"{primary_position} / {secondary_position}"
-        else:
-            return primary_position
+        return _format_position(primary_position, secondary_position)
     
     def _extract_season_id(self, season: str) -> Optional[str]:
         """Extract season ID from season string."""
-        season_mapping = {
-            "2024/25": "317",
-            "2023/24": "281", 
-            "2022/23": "235",
-            "2021/22": "108"
-        }
-        return season_mapping.get(season)
+        return _SEASON_IDS.get(season)
     
     def get_profile_summary(self, player_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a summary of a player's tactical profile without full details.
         Useful for quick checks and validation.
         """
-        ability_scores = self.loader.get_player_ability_scores(player_id)
-        percentiles = self.loader.get_player_percentiles(player_id)
+        ability_scores, percentiles = self.loader.get_player_bundle(player_id)
         
         if not ability_scores and not percentiles:
             return None
@@ -595,9 +637,8 @@ class TacticalProfileService:
         """
         # Load appropriate loader
         if position_group == "deep_progression":
-            from .loader import TacticalProfileLoader
-            loader = TacticalProfileLoader("data/processed/deep_progression_artifacts")
-            self._current_artifacts_dir = "data/processed/deep_progression_artifacts"
+            loader = self._get_dp_loader()
+            self._current_artifacts_dir = _DEEP_PROGRESSION_ARTIFACTS_DIR
         elif position_group == "attacking_mid_winger":
             from .loader import TacticalProfileLoader
             loader = TacticalProfileLoader("data/processed/attacking_midfielders_wingers_artifacts")
@@ -687,8 +728,7 @@ class TacticalProfileService:
         if position_group == "striker":
             loader = self.loader  # Use default striker loader
         elif position_group == "deep_progression":
-            from .loader import TacticalProfileLoader
-            loader = TacticalProfileLoader("data/processed/deep_progression_artifacts")
+            loader = self._get_dp_loader()
         elif position_group == "attacking_mid_winger":
             from .loader import TacticalProfileLoader
             loader = TacticalProfileLoader("data/processed/attacking_midfielders_wingers_artifacts")
@@ -734,11 +774,7 @@ class TacticalProfileService:
                 "percentiles": percentiles or {},
                 "league_reference": league_reference or {},
                 "stats": {},  # Empty stats for historical data
-                "meta": {
-                    "data_version": "v1",
-                    "position_group": position_group,
-                    "is_historical": True
-                }
+                "meta": dict(_META_HISTORICAL[position_group])
             }
             
             evolution_profiles.append(profile)
@@ -823,12 +859,7 @@ class TacticalProfileService:
 
 
 # Global service instance
-_service_instance: Optional[TacticalProfileService] = None
-
-
+@functools.cache
 def get_service() -> TacticalProfileService:
     """Get the global service instance."""
-    global _service_instance
-    if _service_instance is None:
-        _service_instance = TacticalProfileService()
-    return _service_instance
+    return TacticalProfileService()
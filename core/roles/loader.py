@@ -11,11 +11,76 @@ All loaders are memoized for performance.
 
 import os
 import json
+import logging
 import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Any
+import pyarrow.parquet as pq
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# Posterior columns of player_cluster_probs (3 GMM clusters)
+_CLUSTER_KEYS = ("cluster_0", "cluster_1", "cluster_2")
+
+# Remembered (table, player_id, season_id) misses before the set is reset
+_MISS_CACHE_SIZE = 4096
+
+# Columns read from the per-season parquet files (the ones lookups return or use)
+_STYLE_COLS = (
+    "player_id", "player_name", "team_id", "minutes", "season_id",
+    "pca_1", "pca_2", "pca_3", "pca_4", "pca_5", "pca_6"
+)
+_CLUSTER_COLS = ("player_id",) + _CLUSTER_KEYS + ("predicted_cluster",)
+
+
+def _read_season_parquet(path: str, columns: tuple) -> pd.DataFrame:
+    """Read only the wanted columns that exist in a per-season parquet file."""
+    available = set(pq.read_schema(path).names)
+    return pd.read_parquet(path, columns=[c for c in columns if c in available], engine="pyarrow")
+
+
+def _coerce_player_id(player_id: Any) -> Optional[int]:
+    """player_id as the int64 value stored in the artifacts, or None if it isn't an integer id."""
+    try:
+        return int(player_id)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+class _SeasonTable:
+    """Per-season artifact as column arrays plus a player_id -> row position dict (first row wins)."""
+    
+    __slots__ = ("columns", "arrays", "positions")
+    
+    def __init__(self, df: Optional[pd.DataFrame] = None):
+        df = df if df is not None else pd.DataFrame()
+        self.columns = tuple(df.columns)
+        self.arrays: Dict[str, np.ndarray] = {name: df[name].to_numpy() for name in self.columns}
+        self.positions: Dict[Any, int] = {}
+        if "player_id" in df.columns:
+            for i, player_id in enumerate(df["player_id"].astype("int64").tolist()):
+                self.positions.setdefault(player_id, i)
+    
+    def __len__(self) -> int:
+        return len(self.positions)
+    
+    def position(self, player_id: int) -> Optional[int]:
+        """Row position of an (already coerced) int player_id, or None."""
+        return self.positions.get(player_id)
+    
+    def row(self, pos: int) -> Dict[str, Any]:
+        """Row at pos as a dict of native Python values."""
+        return {name: _to_python(self.arrays[name][pos]) for name in self.columns}
+
+
+def _to_python(value: Any) -> Any:
+    """Unbox numpy scalars (object array cells are already Python objects)."""
+    return value.item() if isinstance(value, np.generic) else value
+
 
 class RoleLoader:
     """Loads and caches role artifacts with memoization."""
@@ -40,18 +105,39 @@ class RoleLoader:
         self._cluster_to_role: Optional[Dict[int, str]] = None
         self._role_descriptions: Optional[Dict[str, str]] = None
         self._neighbors_df: Optional[pd.DataFrame] = None
+        self._neighbors_by_anchor: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
         
         # Per-season caches
         self._season_caches: Dict[int, Dict[str, Any]] = {}
+        
+        # Style rows already resolved, keyed by (player_id, season_id)
+        self._style_rows: Dict[Tuple[Any, Any], Dict] = {}
+        
+        # (table, player_id, season_id) lookups known to have no row
+        self._misses: set = set()
+        
+        # Bumped by clear_cache; caches derived from this loader (e.g. role assignments) key on it
+        self.generation = 0
+        
+        # Lazy loading runs once even when several threads hit a cold loader
+        self._init_lock = threading.Lock()
+        self._globals_loaded = False
+        self._season_locks: Dict[int, threading.Lock] = {}
     
     def _load_global_artifacts_if_needed(self) -> None:
-        """Load global artifacts if not already loaded."""
-        if self._cluster_to_role is None:
-            self._load_cluster_to_role()
-        if self._role_descriptions is None:
-            self._load_role_descriptions()
-        if self._neighbors_df is None:
-            self._load_neighbors()
+        """Load global artifacts if not already loaded (once, under a lock)."""
+        if self._globals_loaded:
+            return
+        with self._init_lock:
+            if self._globals_loaded:
+                return
+            if self._cluster_to_role is None:
+                self._load_cluster_to_role()
+            if self._role_descriptions is None:
+                self._load_role_descriptions()
+            if self._neighbors_df is None:
+                self._load_neighbors()
+            self._globals_loaded = True
     
     def _load_cluster_to_role(self) -> None:
         """Load cluster-to-role mapping."""
@@ -72,7 +158,7 @@ class RoleLoader:
                     2: "Poacher"
                 }
         except Exception as e:
-            print(f"Error loading cluster-to-role: {e}")
+            logger.warning("Error loading cluster-to-role: %s", e)
             self._cluster_to_role = {}
     
     def _load_role_descriptions(self) -> None:
@@ -103,7 +189,7 @@ class RoleLoader:
                     "Poacher": "Focuses on box occupation and finishing, limited link play."
                 }
         except Exception as e:
-            print(f"Error loading role descriptions: {e}")
+            logger.warning("Error loading role descriptions: %s", e)
             self._role_descriptions = {}
     
     def _load_neighbors(self) -> None:
@@ -114,24 +200,52 @@ class RoleLoader:
                 self._neighbors_df = pd.read_parquet(neighbors_path)
             else:
                 self._neighbors_df = pd.DataFrame()
+            self._neighbors_by_anchor = self._group_neighbors(self._neighbors_df)
         except Exception as e:
-            print(f"Error loading neighbors: {e}")
+            logger.warning("Error loading neighbors: %s", e)
             self._neighbors_df = pd.DataFrame()
+            self._neighbors_by_anchor = {}
+    
+    @staticmethod
+    def _group_neighbors(neighbors_df: pd.DataFrame) -> Dict[Tuple[int, int], List[Dict[str, Any]]]:
+        """Group neighbor rows by (anchor_player_id, anchor_season_id), keeping the file order."""
+        by_anchor: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+        if neighbors_df.empty:
+            return by_anchor
+        
+        columns = [
+            neighbors_df[name].tolist()
+            for name in ("anchor_player_id", "anchor_season_id", "neighbor_player_id", "neighbor_season_id", "cosine_sim")
+        ]
+        for anchor_player_id, anchor_season_id, neighbor_player_id, neighbor_season_id, cosine_sim in zip(*columns):
+            by_anchor.setdefault((anchor_player_id, anchor_season_id), []).append({
+                "neighbor_player_id": int(neighbor_player_id),
+                "neighbor_season_id": int(neighbor_season_id),
+                "cosine_sim": float(cosine_sim)
+            })
+        return by_anchor
     
     def _ensure_season_cache(self, season_id: int) -> None:
-        """Load all per-season artifacts if not already cached."""
+        """Load all per-season artifacts if not already cached (once per season, under its lock)."""
         if season_id in self._season_caches:
             return
         
+        with self._init_lock:
+            season_lock = self._season_locks.setdefault(season_id, threading.Lock())
+        with season_lock:
+            if season_id not in self._season_caches:
+                self._season_caches[season_id] = self._load_season_cache(season_id)
+    
+    def _load_season_cache(self, season_id: int) -> Dict[str, Any]:
+        """Read the per-season artifacts into a cache dict."""
         season_dir = os.path.join(self.artifacts_root, str(season_id))
         
         if not os.path.exists(season_dir):
-            self._season_caches[season_id] = {
-                "style_vectors": pd.DataFrame(),
-                "cluster_probs": pd.DataFrame(),
+            return {
+                "style_vectors": _SeasonTable(),
+                "cluster_probs": _SeasonTable(),
                 "error": f"Season directory not found: {season_dir}"
             }
-            return
         
         cache = {}
         
@@ -139,28 +253,50 @@ class RoleLoader:
         try:
             style_vec_path = os.path.join(season_dir, "player_style_vectors.parquet")
             if os.path.exists(style_vec_path):
-                cache["style_vectors"] = pd.read_parquet(style_vec_path)
+                cache["style_vectors"] = _SeasonTable(_read_season_parquet(style_vec_path, _STYLE_COLS))
             else:
-                cache["style_vectors"] = pd.DataFrame()
+                cache["style_vectors"] = _SeasonTable()
         except Exception as e:
-            print(f"Error loading style vectors for season {season_id}: {e}")
-            cache["style_vectors"] = pd.DataFrame()
+            logger.warning("Error loading style vectors for season %s: %s", season_id, e)
+            cache["style_vectors"] = _SeasonTable()
         
         # Load cluster probs
         try:
             cluster_probs_path = os.path.join(season_dir, "player_cluster_probs.parquet")
             if os.path.exists(cluster_probs_path):
-                cache["cluster_probs"] = pd.read_parquet(cluster_probs_path)
+                cache["cluster_probs"] = _SeasonTable(_read_season_parquet(cluster_probs_path, _CLUSTER_COLS))
             else:
-                cache["cluster_probs"] = pd.DataFrame()
+                cache["cluster_probs"] = _SeasonTable()
         except Exception as e:
-            print(f"Error loading cluster probs for season {season_id}: {e}")
-            cache["cluster_probs"] = pd.DataFrame()
+            logger.warning("Error loading cluster probs for season %s: %s", season_id, e)
+            cache["cluster_probs"] = _SeasonTable()
         
-        self._season_caches[season_id] = cache
+        return cache
+    
+    def _remember_miss(self, table: str, player_id: Any, season_id: Any) -> None:
+        """Record a lookup with no row; the set is reset once it reaches _MISS_CACHE_SIZE."""
+        if len(self._misses) >= _MISS_CACHE_SIZE:
+            self._misses = set()
+        self._misses.add((table, player_id, season_id))
     
     # ===== Public API =====
     
+    def preload_all_seasons(self, max_workers: int = 4) -> None:
+        """Warm the per-season caches for every season directory (numeric names) in parallel."""
+        try:
+            season_ids = [
+                int(name) for name in os.listdir(self.artifacts_root)
+                if name.isdigit() and os.path.isdir(os.path.join(self.artifacts_root, name))
+            ]
+        except OSError as e:
+            logger.warning("Error listing role seasons in %s: %s", self.artifacts_root, e)
+            return
+        
+        if season_ids:
+            # pyarrow releases the GIL while decoding, so the parquet reads overlap
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(season_ids))) as executor:
+                list(executor.map(self._ensure_season_cache, season_ids))
+    
     def load_cluster_to_role(self) -> Dict[int, str]:
         """Get cluster ID → role name mapping."""
         self._load_global_artifacts_if_needed()
@@ -176,34 +312,40 @@ class RoleLoader:
         Get style vector row for a player in a season.
         
         Returns:
-            {player_id, season_id, minutes, team_id, pca_1..pca_6} or None
+            {player_id, player_name, team_id, minutes, season_id, pca_1..pca_6} or None
         """
+        player_id = _coerce_player_id(player_id)
+        if player_id is None:
+            return None
+        
+        key = (player_id, season_id)
+        if key in self._style_rows:
+            return dict(self._style_rows[key])
+        if ("style_vectors", player_id, season_id) in self._misses:
+            return None
+        
         self._ensure_season_cache(season_id)
         
         if season_id not in self._season_caches:
             return None
         
-        style_df = self._season_caches[season_id].get("style_vectors", pd.DataFrame())
+        style_table = self._season_caches[season_id].get("style_vectors", _SeasonTable())
         
-        if style_df.empty:
+        if not style_table:
             return None
         
         try:
-            # Try to find by player_id
-            row = style_df[style_df["player_id"] == player_id]
-            if row.empty:
-                # Try as int if player_id is string
-                try:
-                    row = style_df[style_df["player_id"] == int(player_id)]
-                except (ValueError, TypeError):
-                    pass
-            
-            if not row.empty:
-                return row.iloc[0].to_dict()
+            pos = style_table.position(player_id)
+            if pos is None:
+                self._remember_miss("style_vectors", player_id, season_id)
+                return None
+            row = style_table.row(pos)
         except Exception as e:
-            print(f"Error getting style row for player {player_id} season {season_id}: {e}")
+            logger.warning("Error getting style row for player %s season %s: %s", player_id, season_id, e)
+            return None
         
-        return None
+        self._style_rows[key] = row
+        return dict(row)
     
     def get_player_cluster_probs(self, player_id: int, season_id: int) -> Optional[Dict]:
         """
@@ -212,42 +354,61 @@ class RoleLoader:
         Returns:
             {cluster_0: float, cluster_1: float, cluster_2: float, predicted_cluster: int} or None
         """
+        player_id = _coerce_player_id(player_id)
+        if player_id is None:
+            return None
+        
+        if ("cluster_probs", player_id, season_id) in self._misses:
+            return None
+        
         self._ensure_season_cache(season_id)
         
         if season_id not in self._season_caches:
             return None
         
-        cluster_df = self._season_caches[season_id].get("cluster_probs", pd.DataFrame())
+        cluster_table = self._season_caches[season_id].get("cluster_probs", _SeasonTable())
         
-        if cluster_df.empty:
+        if not cluster_table:
             return None
         
         try:
-            # Try to find by player_id
-            row = cluster_df[cluster_df["player_id"] == player_id]
-            if row.empty:
-                # Try as int if player_id is string
-                try:
-                    row = cluster_df[cluster_df["player_id"] == int(player_id)]
-                except (ValueError, TypeError):
-                    pass
-            
-            if not row.empty:
-                data = row.iloc[0].to_dict()
+            pos = cluster_table.position(player_id)
+            if pos is not None:
                 # Extract only cluster probabilities and prediction
-                result = {}
-                for i in range(3):  # 3 clusters
-                    key = f"cluster_{i}"
-                    if key in data:
-                        result[key] = float(data[key])
-                if "predicted_cluster" in data:
-                    result["predicted_cluster"] = int(data["predicted_cluster"])
+                arrays = cluster_table.arrays
+                result = {key: float(arrays[key][pos]) for key in _CLUSTER_KEYS if key in arrays}
+                if "predicted_cluster" in arrays:
+                    result["predicted_cluster"] = int(arrays["predicted_cluster"][pos])
                 return result if result else None
+            self._remember_miss("cluster_probs", player_id, season_id)
         except Exception as e:
-            print(f"Error getting cluster probs for player {player_id} season {season_id}: {e}")
+            logger.warning("Error getting cluster probs for player %s season %s: %s", player_id, season_id, e)
         
         return None
     
+    def gather_season_rows(
+        self, table: str, player_ids: List[Any], season_id: int, columns: Tuple[str, ...]
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Gather many players' rows of a per-season table ("style_vectors" or "cluster_probs").
+        
+        Returns:
+            (found mask, {column: values}) with one entry per player_id; each column is
+            one array gather, its values for players not found are meaningless, and
+            columns the table doesn't have are left out
+        """
+        self._ensure_season_cache(season_id)
+        season_table = self._season_caches.get(season_id, {}).get(table, _SeasonTable())
+        positions = [season_table.position(_coerce_player_id(player_id)) for player_id in player_ids]
+        found = np.array([pos is not None for pos in positions], dtype=bool)
+        if not found.any():
+            return found, {}
+        
+        take = np.array([pos if pos is not None else 0 for pos in positions], dtype=np.intp)
+        return found, {
+            name: season_table.arrays[name][take] for name in columns if name in season_table.arrays
+        }
+    
     def get_neighbors(self, player_id: int, season_id: int, top_k: int = 5) -> List[Dict]:
         """
         Get top-K similar players (all seasons) excluding (player_id, season_id) itself.
@@ -261,23 +422,11 @@ class RoleLoader:
             return []
         
         try:
-            # Find neighbors for this (player_id, season_id)
-            neighbors = self._neighbors_df[
-                (self._neighbors_df["anchor_player_id"] == player_id) &
-                (self._neighbors_df["anchor_season_id"] == season_id)
-            ].head(top_k)
-            
-            result = []
-            for _, row in neighbors.iterrows():
-                result.append({
-                    "neighbor_player_id": int(row["neighbor_player_id"]),
-                    "neighbor_season_id": int(row["neighbor_season_id"]),
-                    "cosine_sim": float(row["cosine_sim"])
-                })
-            
-            return result
+            # Precomputed per anchor at load, in the artifact's order
+            neighbors = self._neighbors_by_anchor.get((player_id, season_id), [])[:top_k]
+            return [dict(neighbor) for neighbor in neighbors]
         except Exception as e:
-            print(f"Error getting neighbors for player {player_id} season {season_id}: {e}")
+            logger.warning("Error getting neighbors for player %s season %s: %s", player_id, season_id, e)
             return []
     
     def minutes_threshold(self) -> int:
@@ -286,10 +435,17 @@ class RoleLoader:
     
     def clear_cache(self) -> None:
         """Clear all caches to force reload from disk."""
-        self._cluster_to_role = None
-        self._role_descriptions = None
-        self._neighbors_df = None
-        self._season_caches = {}
+        with self._init_lock:
+            self._globals_loaded = False
+            self._cluster_to_role = None
+            self._role_descriptions = None
+            self._neighbors_df = None
+            self._neighbors_by_anchor = {}
+            self._season_caches = {}
+            self._season_locks = {}
+            self._style_rows = {}
+            self._misses = set()
+            self.generation += 1
 
 
 # Global singleton
@@ -301,6 +457,11 @@ def get_role_loader() -> RoleLoader:
     global _loader_instance
     if _loader_instance is None:
         _loader_instance = RoleLoader()
+        # Warm the per-season caches in the background; lookups that arrive first
+        # load their season lazily under the same per-season lock
+        threading.Thread(
+            target=_loader_instance.preload_all_seasons, name="role-preload", daemon=True
+        ).start()
     return _loader_instance
 
 
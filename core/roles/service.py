@@ -6,8 +6,15 @@ Business logic for:
 - Similar players retrieval with role info
 """
 
-from typing import Dict, List, Optional, Any
-from .loader import get_role_loader
+import functools
+from typing import Dict, List, Optional, Any, Tuple
+
+import numpy as np
+
+from .loader import _CLUSTER_KEYS, _coerce_player_id, get_role_loader
+
+# Role assignments kept in memory (LRU)
+_ROLE_CACHE_SIZE = 4096
 
 
 class RoleService:
@@ -16,6 +23,17 @@ class RoleService:
     def __init__(self, loader=None):
         """Initialize with a loader (defaults to global singleton)."""
         self.loader = loader or get_role_loader()
+        
+        # Snapshots of the loader's global mappings (taken on first role query)
+        self._cluster_to_role: Optional[Dict[int, str]] = None
+        self._role_descriptions: Optional[Dict[str, str]] = None
+    
+    def _role_mappings(self) -> Tuple[Dict[int, str], Dict[str, str]]:
+        """Cluster-to-role and role description mappings, fetched from the loader once (retried while empty)."""
+        if not self._cluster_to_role:
+            self._cluster_to_role = self.loader.load_cluster_to_role()
+            self._role_descriptions = self.loader.load_role_descriptions()
+        return self._cluster_to_role, self._role_descriptions
     
     def get_player_role(self, player_id: int, season_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -30,39 +48,45 @@ class RoleService:
                 "tooltip": str                        # role description
             }
         """
+        # One canonical int id per player, so "123" and 123 share a cache entry
+        player_id = _coerce_player_id(player_id)
+        if player_id is None:
+            return None
+        
+        role = _player_role_cached(self.loader, _loader_generation(self.loader), player_id, season_id)
+        if role is None:
+            return None
+        return {**role, "top_roles": [dict(top_role) for top_role in role["top_roles"]]}
+    
+    def _get_player_role_uncached(self, player_id: int, season_id: int) -> Optional[Dict[str, Any]]:
+        """Get role assignment for a player in a season (see get_player_role)."""
         # Get cluster probabilities
         cluster_probs = self.loader.get_player_cluster_probs(player_id, season_id)
         if not cluster_probs:
             return None
         
-        # Extract posteriors
-        posteriors = {}
-        for i in range(3):  # 3 clusters
-            key = f"cluster_{i}"
-            if key in cluster_probs:
-                posteriors[i] = cluster_probs[key]
+        # Get cluster-to-role mapping
+        cluster_to_role, role_descriptions = self._role_mappings()
         
-        if not posteriors:
+        # Extract posteriors (clusters missing from the row are skipped)
+        cluster_ids = [i for i, key in enumerate(_CLUSTER_KEYS) if key in cluster_probs]
+        if not cluster_ids:
             return None
+        posteriors = np.array([cluster_probs[_CLUSTER_KEYS[i]] for i in cluster_ids], dtype=float)
         
-        # Get cluster-to-role mapping
-        cluster_to_role = self.loader.load_cluster_to_role()
-        role_descriptions = self.loader.load_role_descriptions()
-        
-        # Find primary role (cluster with max posterior)
-        primary_cluster = max(posteriors.keys(), key=lambda k: posteriors[k])
-        max_prob = posteriors[primary_cluster]
-        primary_role = cluster_to_role.get(primary_cluster, "Unknown")
+        # Find primary role (cluster with max posterior; first one wins ties)
+        primary_idx = int(posteriors.argmax())
+        max_prob = float(posteriors[primary_idx])
+        primary_role = cluster_to_role.get(cluster_ids[primary_idx], "Unknown")
         
         # Determine if hybrid (max posterior < 0.60)
         is_hybrid = max_prob < 0.60
         
-        # Build top_roles list
-        sorted_clusters = sorted(posteriors.items(), key=lambda x: x[1], reverse=True)
-        top_roles = []
-        for cluster_id, prob in sorted_clusters[:2]:  # Top 2
-            role_name = cluster_to_role.get(cluster_id, "Unknown")
-            top_roles.append({"role": role_name, "prob": round(prob, 3)})
+        # Build top_roles list (top 2, descending; stable so ties keep cluster order)
+        top_roles = [
+            {"role": cluster_to_role.get(cluster_ids[idx], "Unknown"), "prob": round(float(posteriors[idx]), 3)}
+            for idx in np.argsort(-posteriors, kind="stable")[:2].tolist()
+        ]
         
         # Get tooltip
         tooltip = role_descriptions.get(primary_role, "")
@@ -92,33 +116,66 @@ class RoleService:
         """
         # Get neighbors
         neighbors = self.loader.get_neighbors(player_id, season_id, top_k=k)
+        if not neighbors:
+            return []
         
-        result = []
-        for neighbor in neighbors:
-            neighbor_player_id = neighbor["neighbor_player_id"]
-            neighbor_season_id = neighbor["neighbor_season_id"]
-            cosine_sim = neighbor["cosine_sim"]
+        # Neighbor positions grouped by season, so each season's rows are gathered at once
+        by_season: Dict[Any, List[int]] = {}
+        for i, neighbor in enumerate(neighbors):
+            by_season.setdefault(neighbor["neighbor_season_id"], []).append(i)
+        
+        cluster_to_role = None
+        roles: List[Optional[Tuple[str, float]]] = [None] * len(neighbors)
+        player_names: List[Any] = [None] * len(neighbors)
+        team_ids: List[Any] = [None] * len(neighbors)
+        for neighbor_season_id, positions in by_season.items():
+            neighbor_player_ids = [neighbors[i]["neighbor_player_id"] for i in positions]
+            
+            # Neighbor roles from their posteriors (same rules as get_player_role)
+            found, probs = self.loader.gather_season_rows(
+                "cluster_probs", neighbor_player_ids, neighbor_season_id, _CLUSTER_KEYS
+            )
+            cluster_ids = [i for i, key in enumerate(_CLUSTER_KEYS) if key in probs]
+            if not cluster_ids:
+                continue
+            if cluster_to_role is None:
+                cluster_to_role, _ = self._role_mappings()
+            posteriors = np.column_stack([probs[_CLUSTER_KEYS[i]].astype(float) for i in cluster_ids])
+            primary = posteriors.argmax(axis=1)
+            max_probs = posteriors[np.arange(len(positions)), primary]
             
-            # Get neighbor's role
-            neighbor_role = self.get_player_role(neighbor_player_id, neighbor_season_id)
+            # Player metadata, if available
+            style_found, style = self.loader.gather_season_rows(
+                "style_vectors", neighbor_player_ids, neighbor_season_id, ("player_name", "team_id")
+            )
+            names = style["player_name"].tolist() if "player_name" in style else None
+            teams = style["team_id"].tolist() if "team_id" in style else None
             
-            if neighbor_role:
-                similarity_pct = round(100 * cosine_sim)
-                
-                # Try to get player metadata if available
-                style_row = self.loader.get_player_style_row(neighbor_player_id, neighbor_season_id)
-                player_name = style_row.get("player_name", f"Player {neighbor_player_id}") if style_row else f"Player {neighbor_player_id}"
-                team_id = style_row.get("team_id") if style_row else None
-                
-                result.append({
-                    "player_id": neighbor_player_id,
-                    "season_id": neighbor_season_id,
-                    "similarity": similarity_pct,
-                    "role": neighbor_role["role"],
-                    "confidence": neighbor_role["confidence"],
-                    "player_name": player_name,
-                    "team_id": team_id
-                })
+            for j, (i, is_found, cluster_idx, max_prob) in enumerate(
+                zip(positions, found.tolist(), primary.tolist(), max_probs.tolist())
+            ):
+                if not is_found:
+                    continue
+                roles[i] = (cluster_to_role.get(cluster_ids[cluster_idx], "Unknown"), round(max_prob, 3))
+                if style_found[j]:
+                    player_names[i] = names[j] if names is not None else f"Player {neighbor_player_ids[j]}"
+                    team_ids[i] = teams[j] if teams is not None else None
+                else:
+                    player_names[i] = f"Player {neighbor_player_ids[j]}"
+        
+        result = []
+        for neighbor, role, player_name, team_id in zip(neighbors, roles, player_names, team_ids):
+            if role is None:
+                continue
+            result.append({
+                "player_id": neighbor["neighbor_player_id"],
+                "season_id": neighbor["neighbor_season_id"],
+                "similarity": round(100 * neighbor["cosine_sim"]),
+                "role": role[0],
+                "confidence": role[1],
+                "player_name": player_name,
+                "team_id": team_id
+            })
         
         return result
     
@@ -128,6 +185,27 @@ class RoleService:
         return cluster_probs is not None and len(cluster_probs) > 0
 
 
+def _loader_generation(loader) -> int:
+    """Cache generation of a loader (bumped by RoleLoader.clear_cache; 0 for loaders without one)."""
+    return getattr(loader, "generation", 0)
+
+
+@functools.lru_cache(maxsize=_ROLE_CACHE_SIZE)
+def _player_role_cached(loader, generation: int, player_id: int, season_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Role assignments only depend on the loader's artifacts, so neighbors that show up
+    across many similarity requests resolve once. Keyed on the loader's generation, so
+    entries from before RoleLoader.clear_cache() are never hit again (they age out).
+    """
+    return _role_service_for(loader, generation)._get_player_role_uncached(player_id, season_id)
+
+
+@functools.lru_cache(maxsize=8)
+def _role_service_for(loader, generation: int) -> RoleService:
+    """One service per loader generation for cache misses, so the mapping snapshots are reused."""
+    return RoleService(loader)
+
+
 def get_role_service(loader=None) -> RoleService:
     """Get a role service instance."""
     return RoleService(loader=loader)
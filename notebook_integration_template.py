@@ -30,15 +30,11 @@ def generate_tactical_profile_artifacts():
     
     # 2. Save ability scores (normalized)
     ability_scores_df = ability_df_norm.copy()
-    ability_scores_df.to_parquet(os.path.join(artifacts_dir, "ability_scores.parquet"))
+    ability_scores_df.to_parquet(os.path.join(artifacts_dir, "ability_scores.parquet"), engine="pyarrow", compression="snappy")
     
-    # 3. Calculate percentiles
-    percentiles_data = {}
-    for col in ability_df_norm.columns:
-        percentiles_data[col] = ability_df_norm[col].rank(pct=True) * 100
-    
-    percentiles_df = pd.DataFrame(percentiles_data, index=ability_df_norm.index)
-    percentiles_df.to_parquet(os.path.join(artifacts_dir, "ability_percentiles.parquet"))
+    # 3. Calculate percentiles (all axes ranked in one call)
+    percentiles_df = ability_df_norm.rank(pct=True) * 100
+    percentiles_df.to_parquet(os.path.join(artifacts_dir, "ability_percentiles.parquet"), engine="pyarrow", compression="snappy")
     
     # 4. Generate league reference (median values)
     league_ref = percentiles_df.median().to_dict()
@@ -7,10 +7,13 @@ PCA vectors and GMM results directly without recomputing.
 
 import os
 import json
-import pickle
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+import joblib
 import pandas as pd
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 
 # Fixed role mappings
@@ -26,6 +29,15 @@ ROLE_DESCRIPTIONS = {
     "Poacher": "Focuses on box occupation and finishing, limited link play."
 }
 
+# Parquet compression for every role artifact (written and read back with pyarrow)
+PARQUET_COMPRESSION = "snappy"
+
+# Artifacts identical for every season: written once to the root, linked from each season dir
+SHARED_ARTIFACTS = ("gmm_model.joblib", "cluster_to_role.json", "role_descriptions.json")
+
+# Per-season files from the previous layout, removed when a season is rewritten
+SUPERSEDED_ARTIFACTS = ("gmm_model.pkl",)
+
 
 def save_role_artifacts(
     pca_vectors,
@@ -48,68 +60,38 @@ def save_role_artifacts(
     """
     os.makedirs(artifacts_root, exist_ok=True)
     
-    # Get unique seasons from the data
-    seasons = striker_df_with_season['season_id'].unique()
-    
-    print(f"Saving role artifacts for {len(seasons)} seasons...\n")
-    
-    all_season_data = []
-    
-    for season_id in sorted(seasons):
-        season_dir = os.path.join(artifacts_root, str(season_id))
-        os.makedirs(season_dir, exist_ok=True)
-        
-        # Filter to this season
-        season_mask = striker_df_with_season['season_id'] == season_id
-        season_strikers = striker_df_with_season[season_mask].copy()
-        season_pca = pca_vectors[season_mask]
-        season_posteriors = posteriors[season_mask]
-        season_assignments = assignments[season_mask]
-        
-        # Create player_style_vectors.parquet
-        style_vectors_df = season_strikers[['player_id', 'player_name', 'team_id', 'team_name']].copy()
-        style_vectors_df['season_id'] = season_id
-        if 'player_season_minutes' in season_strikers.columns:
-            style_vectors_df['minutes'] = season_strikers['player_season_minutes'].values
-        else:
-            style_vectors_df['minutes'] = 0
-        
-        for i in range(season_pca.shape[1]):
-            style_vectors_df[f'pca_{i+1}'] = season_pca[:, i]
-        
-        style_vectors_df.to_parquet(
-            os.path.join(season_dir, "player_style_vectors.parquet"),
-            index=False
-        )
-        
-        # Create player_cluster_probs.parquet
-        cluster_probs_df = season_strikers[['player_id']].copy()
-        cluster_probs_df['season_id'] = season_id
-        
-        for i in range(season_posteriors.shape[1]):
-            cluster_probs_df[f'cluster_{i}'] = season_posteriors[:, i]
-        
-        cluster_probs_df['predicted_cluster'] = season_assignments
-        cluster_probs_df.to_parquet(
-            os.path.join(season_dir, "player_cluster_probs.parquet"),
-            index=False
+    # Save GMM model (compressed; load with joblib.load) and role configs once (same for all seasons)
+    joblib.dump(gmm_model, os.path.join(artifacts_root, "gmm_model.joblib"), compress=3)
+    
+    with open(os.path.join(artifacts_root, "cluster_to_role.json"), "w") as f:
+        json.dump(CLUSTER_TO_ROLE, f, indent=2)
+    
+    with open(os.path.join(artifacts_root, "role_descriptions.json"), "w") as f:
+        json.dump(ROLE_DESCRIPTIONS, f, indent=2)
+    
+    # Row positions of each season, from one grouping pass (seasons in sorted order)
+    season_rows = striker_df_with_season.groupby('season_id', sort=True).indices
+    
+    print(f"Saving role artifacts for {len(season_rows)} seasons...\n")
+    
+    # Seasons are written concurrently (pyarrow encodes and writes outside the GIL);
+    # results come back in season order for the neighbor step
+    def write_season(season_id, rows):
+        return _save_season_artifacts(
+            season_id,
+            striker_df_with_season.iloc[rows],
+            pca_vectors[rows],
+            posteriors[rows],
+            assignments[rows],
+            artifacts_root
         )
-        
-        # Save GMM model (same for all seasons)
-        with open(os.path.join(season_dir, "gmm_model.pkl"), "wb") as f:
-            pickle.dump(gmm_model, f)
-        
-        # Save configs
-        with open(os.path.join(season_dir, "cluster_to_role.json"), "w") as f:
-            json.dump(CLUSTER_TO_ROLE, f, indent=2)
-        
-        with open(os.path.join(season_dir, "role_descriptions.json"), "w") as f:
-            json.dump(ROLE_DESCRIPTIONS, f, indent=2)
-        
-        print(f"✓ Saved season {season_id} artifacts: {len(season_strikers)} strikers")
-        
-        # Collect for multi-season neighbors
-        all_season_data.append((season_id, style_vectors_df, cluster_probs_df))
+    
+    max_workers = max(1, min(len(season_rows), os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        all_season_data = list(executor.map(write_season, season_rows.keys(), season_rows.values()))
+    
+    for season_id, style_vectors_table, _ in all_season_data:
+        print(f"✓ Saved season {season_id} artifacts: {style_vectors_table.num_rows} strikers")
     
     # Save multi-season neighbors
     _save_multiseasson_neighbors(all_season_data, artifacts_root)
@@ -118,61 +100,154 @@ def save_role_artifacts(
     _save_global_config(artifacts_root)
 
 
+def _save_season_artifacts(
+    season_id,
+    season_strikers: pd.DataFrame,
+    season_pca,
+    season_posteriors,
+    season_assignments,
+    artifacts_root: str
+):
+    """Save one season's style vectors and cluster probabilities; returns (season_id, style table, cluster table)."""
+    season_dir = os.path.join(artifacts_root, str(season_id))
+    os.makedirs(season_dir, exist_ok=True)
+    
+    n_players = len(season_strikers)
+    season_column = np.full(n_players, season_id, dtype=np.int64)
+    
+    # Create player_style_vectors.parquet (Arrow columns built straight from the arrays)
+    if 'player_season_minutes' in season_strikers.columns:
+        minutes = season_strikers['player_season_minutes'].to_numpy()
+    else:
+        minutes = np.zeros(n_players, dtype=np.int64)
+    
+    # L2-normalized copies of the PCA vectors (zero vectors stay zero), so cosine
+    # similarity is a plain dot product for every reader. These keep full precision;
+    # the raw pca_* columns are stored as float16 (display/analysis only)
+    norms = np.linalg.norm(season_pca, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    unit_pca = season_pca / norms
+    
+    style_vectors_table = pa.Table.from_pydict({
+        'player_id': season_strikers['player_id'],
+        'player_name': season_strikers['player_name'],
+        'team_id': season_strikers['team_id'],
+        'team_name': season_strikers['team_name'],
+        'season_id': season_column,
+        'minutes': minutes,
+        **{f'pca_{i+1}': season_pca[:, i].astype(np.float16) for i in range(season_pca.shape[1])},
+        **{f'unit_pca_{i+1}': unit_pca[:, i] for i in range(unit_pca.shape[1])}
+    })
+    pq.write_table(
+        style_vectors_table,
+        os.path.join(season_dir, "player_style_vectors.parquet"),
+        compression=PARQUET_COMPRESSION
+    )
+    
+    # Create player_cluster_probs.parquet
+    cluster_probs_table = pa.Table.from_pydict({
+        'player_id': season_strikers['player_id'],
+        'season_id': season_column,
+        **{f'cluster_{i}': season_posteriors[:, i] for i in range(season_posteriors.shape[1])},
+        'predicted_cluster': np.asarray(season_assignments)
+    })
+    pq.write_table(
+        cluster_probs_table,
+        os.path.join(season_dir, "player_cluster_probs.parquet"),
+        compression=PARQUET_COMPRESSION
+    )
+    
+    # Link GMM model and configs from the root
+    for filename in SHARED_ARTIFACTS:
+        _link_shared_artifact(artifacts_root, season_dir, filename)
+    
+    # Drop the old per-season pickle so it can't be loaded instead of the current model
+    for filename in SUPERSEDED_ARTIFACTS:
+        stale_path = os.path.join(season_dir, filename)
+        if os.path.lexists(stale_path):
+            os.remove(stale_path)
+    
+    return season_id, style_vectors_table, cluster_probs_table
+
+
+def _link_shared_artifact(artifacts_root: str, season_dir: str, filename: str):
+    """Point season_dir/filename at the root copy (relative symlink, or a file copy where symlinks are unavailable)."""
+    target = os.path.join(season_dir, filename)
+    if os.path.lexists(target):
+        os.remove(target)
+    
+    try:
+        os.symlink(os.path.join("..", filename), target)
+    except (OSError, NotImplementedError):
+        shutil.copyfile(os.path.join(artifacts_root, filename), target)
+
+
 def _save_multiseasson_neighbors(
     all_season_data: list,
     artifacts_root: str = "data/processed/roles",
-    top_k: int = 10
+    top_k: int = 10,
+    block_size: int = 2048
 ):
-    """Build and save multi-season neighbor similarity data."""
-    
-    # Combine all PCA vectors
-    combined_vectors = []
-    combined_metadata = []
-    
-    for season_id, style_df, _ in all_season_data:
-        pca_cols = [c for c in style_df.columns if c.startswith('pca_')]
-        vectors = style_df[pca_cols].values
-        
-        for position, (idx, row) in enumerate(style_df.iterrows()):
-            combined_vectors.append(vectors[position])
-            combined_metadata.append({
-                'player_id': row['player_id'],
-                'season_id': row['season_id'],
-            })
+    """Build and save multi-season neighbor similarity data (from the per-season style vector tables)."""
     
-    combined_vectors = np.array(combined_vectors)
-    print(f"\nBuilding neighbor similarity ({len(combined_vectors)} player-seasons)...")
-    
-    # Compute pairwise cosine similarity
-    similarity_matrix = cosine_similarity(combined_vectors)
-    
-    # Extract top-K neighbors for each row
-    neighbors_list = []
-    
-    for i in range(len(combined_metadata)):
-        anchor = combined_metadata[i]
-        sims = similarity_matrix[i]
-        
-        # Get indices sorted by similarity (excluding self at index i)
-        neighbor_indices = np.argsort(-sims)[1:top_k+1]
-        
-        for neighbor_idx in neighbor_indices:
-            neighbor = combined_metadata[neighbor_idx]
-            sim_score = float(sims[neighbor_idx])
-            
-            neighbors_list.append({
-                'anchor_player_id': anchor['player_id'],
-                'anchor_season_id': anchor['season_id'],
-                'neighbor_player_id': neighbor['player_id'],
-                'neighbor_season_id': neighbor['season_id'],
-                'cosine_sim': sim_score
-            })
+    # Combine all normalized PCA vectors (one row per player-season, in season order)
+    unit_vectors = []
+    player_ids = []
+    season_ids = []
     
-    neighbors_df = pd.DataFrame(neighbors_list)
+    for season_id, style_table, _ in all_season_data:
+        unit_cols = [c for c in style_table.column_names if c.startswith('unit_pca_')]
+        unit_vectors.append(np.column_stack([style_table.column(c).to_numpy() for c in unit_cols]).astype(np.float64))
+        player_ids.append(style_table.column('player_id').to_numpy())
+        season_ids.append(style_table.column('season_id').to_numpy())
+    
+    unit_vectors = np.vstack(unit_vectors)
+    player_ids = np.concatenate(player_ids)
+    season_ids = np.concatenate(season_ids)
+    n_rows = len(unit_vectors)
+    print(f"\nBuilding neighbor similarity ({n_rows} player-seasons)...")
+    
+    # Cosine similarity as matrix products of the stored unit vectors
+    # (zero vectors stay zero, as in sklearn's cosine_similarity)
+    # Rows are scored in blocks so only block_size x N similarities exist at a time;
+    # top-(K+1) per row without sorting the whole row, then the anchor itself is masked out
+    # by index (not by rank: identical player-seasons tie with it at similarity 1).
+    # Each block's neighbors are streamed to the parquet file as one record batch.
+    n_keep = min(top_k + 1, n_rows)
+    n_neighbors = n_keep - 1
     neighbors_path = os.path.join(artifacts_root, "player_neighbors.parquet")
-    neighbors_df.to_parquet(neighbors_path, index=False)
+    n_records = 0
+    writer = None
+    try:
+        for start in range(0, n_rows, block_size):
+            block_sims = unit_vectors[start:start + block_size] @ unit_vectors.T
+            if n_keep < n_rows:
+                candidates = np.argpartition(-block_sims, n_keep - 1, axis=1)[:, :n_keep]
+            else:
+                candidates = np.tile(np.arange(n_rows), (len(block_sims), 1))
+            candidate_sims = np.take_along_axis(block_sims, candidates, axis=1)
+            anchors = np.arange(start, start + len(block_sims))[:, None]
+            candidate_sims[candidates == anchors] = -np.inf
+            order = np.argsort(-candidate_sims, axis=1, kind='stable')[:, :n_neighbors]
+            neighbor_indices = np.take_along_axis(candidates, order, axis=1).ravel()
+            neighbor_sims = np.take_along_axis(candidate_sims, order, axis=1).ravel()
+            
+            batch = pa.RecordBatch.from_pydict({
+                'anchor_player_id': np.repeat(player_ids[start:start + block_size], n_neighbors),
+                'anchor_season_id': np.repeat(season_ids[start:start + block_size], n_neighbors),
+                'neighbor_player_id': player_ids[neighbor_indices],
+                'neighbor_season_id': season_ids[neighbor_indices],
+                'cosine_sim': neighbor_sims
+            })
+            if writer is None:
+                writer = pq.ParquetWriter(neighbors_path, batch.schema, compression=PARQUET_COMPRESSION)
+            writer.write_batch(batch)
+            n_records += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
     
-    print(f"✓ Saved {len(neighbors_df)} neighbor records")
+    print(f"✓ Saved {n_records} neighbor records")
 
 
 def _save_global_config(
@@ -9,6 +9,7 @@ Tactical profiles are available for any outfield players with at least 500 minut
 # ===== IMPORTS & PAGE CONFIG =====
 import streamlit as st
 from api.client import client
+import numpy as np
 import pandas as pd
 from core.profiles.service import get_service
 from core.performance.service import get_performance_service
@@ -18,8 +19,6 @@ from ui.components.radar import render_tactical_profile_panel
 from ui.components.performance_radar import render_performance_profile_panel
 from ui.components.player_role_header import render_player_role_section
 
-from ui.components.radar import render_tactical_profile_panel
-
 # Page configuration
 st.set_page_config(
     page_title="Player Database – Liga MX",
@@ -27,8 +26,15 @@ st.set_page_config(
     layout="wide"
 )
 
-# Force reload of role loader to get latest cluster names
-reset_role_loader()
+# Force reload of role loader to get latest cluster names (once per server process,
+# so the role caches survive reruns)
+@st.cache_resource
+def reload_role_artifacts_once() -> bool:
+    reset_role_loader()
+    return True
+
+
+reload_role_artifacts_once()
 
 
 # ===== BUSINESS LOGIC (NO STREAMLIT BELOW) =====
@@ -74,6 +80,30 @@ def feature_fetch_season(api_client, *, competition_id: int, season_id: int) ->
         return None
 
 
+def _column_values(df, name: str, default=None) -> list:
+    """Values of a DataFrame column as a Python list (default repeated if the column is missing)."""
+    return df[name].tolist() if name in df.columns else [default] * len(df)
+
+
+def _id_column(df, name: str) -> pd.Series:
+    """Player ids of a DataFrame column as numbers (NaN if missing or not numeric), for joining."""
+    return pd.to_numeric(pd.Series(_column_values(df, name), dtype=object), errors='coerce')
+
+
+def _season_totals(per90: list, minutes: np.ndarray) -> list:
+    """Season totals from per-90 rates for all players at once (rounded half-to-even like round(); 0 without minutes)."""
+    per90 = np.nan_to_num(np.asarray(per90, dtype=float))
+    played = minutes > 0
+    totals = np.zeros(len(minutes), dtype=np.int64)
+    totals[played] = np.rint(per90[played] * minutes[played] / 90)
+    return totals.tolist()
+
+
+def _filter_options(values) -> list:
+    """Sorted distinct non-empty values of a column, for the filter widgets."""
+    return sorted(value for value in pd.unique(pd.Series(values, dtype=object).dropna()) if value)
+
+
 def feature_compute_rows(payload: dict) -> dict | None:
     """
     Joins Season Player Stats with Player Mapping on player_id.
@@ -82,10 +112,13 @@ def feature_compute_rows(payload: dict) -> dict | None:
     Returns:
       {
         'rows': list[dict],         # final table rows (see columns)
+        'table': pd.DataFrame,      # the same rows as an object-dtype table for filtering
+                                    # (Age as Int64, + _player_lc, _primary_position, _secondary_position)
         'teams': list[str],         # unique team_name
         'positions': list[str],     # unique primary_position
         'foots': list[str],         # unique preferred foot values
-        'age_min': int, 'age_max': int
+        'age_min': int, 'age_max': int,
+        'max_minutes': int          # upper bound for the minutes slider
       }
     """
     if payload is None or payload.get('season_stats') is None:
@@ -98,7 +131,6 @@ def feature_compute_rows(payload: dict) -> dict | None:
         return None
     
     # Convert to DataFrame for easier processing
-    import pandas as pd
     stats_df = pd.DataFrame(season_stats)
     
     # Check if this is player-level or team-level data
@@ -106,122 +138,115 @@ def feature_compute_rows(payload: dict) -> dict | None:
         # Team-level fallback - return basic team data
         return {
             'rows': stats_df.to_dict('records'),
+            'table': stats_df.astype(object),
             'teams': stats_df['team_name'].unique().tolist() if 'team_name' in stats_df.columns else [],
             'positions': [],
             'foots': [],
             'age_min': 0,
-            'age_max': 0
+            'age_max': 0,
+            'max_minutes': int(max(_column_values(stats_df, 'Minutes', 0)))
         }
     
     # Player-level data processing
-    rows = []
-    teams = set()
-    positions = set()
-    foots = set()
-    ages = []
-    
-    # Create mapping lookup if available
-    mapping_lookup = {}
+    # Mapping data keyed by player id (player_id, else offline/live id; the last row wins for duplicates)
+    mapping_cols = pd.DataFrame({'player_key': pd.Series(dtype=float), 'Foot': pd.Series(dtype=object), 'Age': pd.Series(dtype='Int64')})
     if mapping is not None and len(mapping) > 0:
         try:
             mapping_df = pd.DataFrame(mapping)
             
-            for _, row in mapping_df.iterrows():
-                player_id = row.get('player_id') or row.get('offline_player_id') or row.get('live_player_id')
-                if player_id:
-                    mapping_lookup[player_id] = {
-                        'preferred_foot': row.get('player_preferred_foot', '—'),
-                        'birth_date': row.get('player_birth_date')
-                    }
+            player_key = _id_column(mapping_df, 'player_id')
+            for fallback in ('offline_player_id', 'live_player_id'):
+                fallback_ids = _id_column(mapping_df, fallback)
+                player_key = player_key.where(player_key.notna() & (player_key != 0), fallback_ids)
+            
+            # Ages as of today for all birth dates at once (NA if missing or not YYYY-MM-DD);
+            # month * 100 + day orders birthdays within a year
+            birth_dt = pd.to_datetime(
+                pd.Series(_column_values(mapping_df, 'player_birth_date'), dtype=object), format='%Y-%m-%d', errors='coerce'
+            )
+            today = pd.Timestamp.now()
+            before_birthday = birth_dt.dt.month * 100 + birth_dt.dt.day > today.month * 100 + today.day
+            
+            mapping_cols = pd.DataFrame({
+                'player_key': player_key,
+                'Foot': pd.Series(_column_values(mapping_df, 'player_preferred_foot', '—'), dtype=object),
+                'Age': (today.year - birth_dt.dt.year - before_birthday.astype(int)).astype('Int64')
+            })
+            mapping_cols = mapping_cols[mapping_cols['player_key'].notna() & (mapping_cols['player_key'] != 0)]
+            mapping_cols = mapping_cols.drop_duplicates('player_key', keep='last')
         except Exception as e:
             print(f"Error processing mapping data: {e}")
     
-    # Process each player
-    for _, player in stats_df.iterrows():
-        player_id = player.get('player_id')
-        player_name = player.get('player_name', '—')
-        team_name = player.get('team_name', '—')
-        primary_position = player.get('primary_position', '—')
-        secondary_position = player.get('secondary_position', '—')
-        minutes = player.get('player_season_minutes', 0)
-        appearances = player.get('player_season_appearances', 0)
-        goals_90 = player.get('player_season_goals_90', 0)
-        assists_90 = player.get('player_season_assists_90', 0)
-        
-        # Calculate total goals and assists from per-90 stats
-        total_goals = round(goals_90 * minutes / 90) if minutes > 0 else 0
-        total_assists = round(assists_90 * minutes / 90) if minutes > 0 else 0
-        
-        # Round minutes to nearest full minute
-        minutes = int(round(minutes)) if minutes > 0 else 0
-        
-        # Position display
-        if secondary_position and secondary_position != '—':
-            position_display = f"{primary_position} / {secondary_position}"
-        else:
-            position_display = primary_position
-        
-        # Get mapping data
-        preferred_foot = '—'
-        age = '—'
-        
-        if player_id and player_id in mapping_lookup:
-            mapping_data = mapping_lookup[player_id]
-            preferred_foot = mapping_data['preferred_foot']
-            
-            # Calculate age from birth date
-            birth_date = mapping_data['birth_date']
-            if birth_date:
-                try:
-                    from datetime import datetime
-                    birth_dt = datetime.strptime(birth_date, '%Y-%m-%d')
-                    # Calculate age as of today
-                    today = datetime.now()
-                    age = today.year - birth_dt.year - ((today.month, today.day) < (birth_dt.month, birth_dt.day))
-                    ages.append(age)
-                except:
-                    age = '—'
-        
-        # Create row
-        row = {
-            'player_id': player_id,
-            'Player': player_name,
-            'Team': team_name,
-            'Position': position_display,
-            'Minutes': minutes,
-            'Appearances': appearances,
-            'Goals': total_goals,
-            'Assists': total_assists,
-            'Foot': preferred_foot,
-            'Age': age
-        }
-        
-        rows.append(row)
-        
-        # Collect filter options (filter out None values)
-        if team_name:
-            teams.add(team_name)
-        if primary_position:
-            positions.add(primary_position)
-        if preferred_foot:
-            foots.add(preferred_foot)
+    # Left join on player id (one merged row per stats row, in stats order)
+    stats_keys = pd.DataFrame({'player_key': _id_column(stats_df, 'player_id')})
+    merged = stats_keys.merge(mapping_cols, on='player_key', how='left', validate='many_to_one')
+    matched = merged['player_key'].isin(mapping_cols['player_key']).to_numpy()
+    
+    # Total goals and assists from per-90 stats; minutes rounded to the nearest full minute
+    minutes_array = np.asarray(_column_values(stats_df, 'player_season_minutes', 0), dtype=float)
+    played = minutes_array > 0
+    minutes = np.zeros(len(minutes_array), dtype=np.int64)
+    minutes[played] = np.rint(minutes_array[played])
+    
+    # Position display ("primary / secondary" when a secondary position is set)
+    primary = pd.Series(_column_values(stats_df, 'primary_position', '—'), dtype=object)
+    secondary = pd.Series(_column_values(stats_df, 'secondary_position', '—'), dtype=object)
+    has_secondary = (secondary.notna() & secondary.astype(bool) & (secondary != '—')).to_numpy()
+    position_display = np.where(has_secondary, primary.map(str) + ' / ' + secondary.map(str), primary.to_numpy())
+    
+    # Foot and age from the mapping ('—' when the player is not mapped or has no known age)
+    age_column = merged['Age'].where(matched)
+    ages = age_column.dropna().tolist()
+    
+    table = pd.DataFrame({
+        'player_id': _column_values(stats_df, 'player_id'),
+        'Player': _column_values(stats_df, 'player_name', '—'),
+        'Team': _column_values(stats_df, 'team_name', '—'),
+        'Position': position_display.tolist(),
+        'Minutes': minutes.tolist(),
+        'Appearances': _column_values(stats_df, 'player_season_appearances', 0),
+        'Goals': _season_totals(_column_values(stats_df, 'player_season_goals_90', 0), minutes_array),
+        'Assists': _season_totals(_column_values(stats_df, 'player_season_assists_90', 0), minutes_array),
+        'Foot': np.where(matched, merged['Foot'].to_numpy(dtype=object), '—').tolist(),
+        'Age': age_column.astype(object).fillna('—').tolist()
+    }, dtype=object)
+    rows = table.to_dict('records')
     
     # Calculate age range
     age_min = min(ages) if ages else 0
     age_max = max(ages) if ages else 0
     
+    # Lowercase names computed once per dataset for the search filter (Arrow-backed, so the
+    # substring match runs in pyarrow's string kernel); ages as nullable integers (NA instead
+    # of '—') for the age range filter
+    table['_player_lc'] = table['Player'].str.lower().astype('string[pyarrow]')
+    table['Age'] = age_column.array
+    
+    # Raw positions behind the Position display, for the position filter and the profile lookup
+    table['_primary_position'] = pd.Series(primary.where(primary.notna(), None), dtype=object)
+    table['_secondary_position'] = pd.Series(np.where(has_secondary, secondary.to_numpy(), None), dtype=object)
+    
     return {
         'rows': rows,
-        'teams': sorted(list(teams)),
-        'positions': sorted(list(positions)),
-        'foots': sorted(list(foots)),
+        'table': table,
+        'teams': _filter_options(table['Team']),
+        'positions': _filter_options(_column_values(stats_df, 'primary_position', '—')),
+        'foots': _filter_options(table['Foot']),
         'age_min': age_min,
-        'age_max': age_max
+        'age_max': age_max,
+        'max_minutes': int(minutes.max()) if len(minutes) else 0
     }
 
 
+def _table_column(table: pd.DataFrame, name: str, default=None) -> pd.Series:
+    """Column of the rows table (default for every row if the column is missing)."""
+    if name in table.columns:
+        return table[name]
+    return pd.Series([default] * len(table), index=table.index, dtype=object)
+
+
 def feature_filter_rows(
-    rows: list[dict],
+    table: pd.DataFrame,
     *,
     q: str,
     teams: list[str],
@@ -229,45 +254,54 @@ def feature_filter_rows(
     foots: list[str],
     age_range: tuple[int, int],
     min_minutes: int
-) -> list[dict]:
-    """Applies all filters. Keep fast and pure (no streamlit here)."""
-    if not rows:
-        return []
+) -> pd.DataFrame:
+    """Applies all filters as one boolean mask over the rows table. Keep fast and pure (no streamlit here)."""
+    if table is None or table.empty:
+        return pd.DataFrame()
     
-    filtered = rows.copy()
+    mask = np.ones(len(table), dtype=bool)
     
     # Search filter (case-insensitive substring match on Player name)
     if q:
-        filtered = [row for row in filtered if q.lower() in row.get('Player', '').lower()]
+        if '_player_lc' in table.columns:
+            names_lc = table['_player_lc']
+        else:
+            names_lc = _table_column(table, 'Player', '').str.lower()
+        mask &= names_lc.str.contains(q.lower(), regex=False, na=False).to_numpy(dtype=bool, na_value=False)
     
     # Team filter
     if teams:
-        filtered = [row for row in filtered if row.get('Team') in teams]
+        mask &= _table_column(table, 'Team').isin(teams).to_numpy()
     
-    # Position filter
+    # Position filter (primary part of the position display)
     if positions:
-        filtered = [row for row in filtered 
-                   if row.get('Position') and 
-                   row.get('Position', '').split(' / ')[0] in positions]
+        if '_primary_position' in table.columns:
+            primary = table['_primary_position']
+        else:
+            primary = _table_column(table, 'Position').str.split(' / ', n=1).str[0]
+        mask &= primary.isin(positions).to_numpy()
     
     # Foot filter
     if foots:
-        filtered = [row for row in filtered if row.get('Foot') in foots]
+        mask &= _table_column(table, 'Foot').isin(foots).to_numpy()
     
     # Age range filter
     if age_range[0] > 0 or age_range[1] < 100:
-        filtered = [row for row in filtered 
-                   if row.get('Age') != '—' and 
-                   age_range[0] <= row.get('Age', 0) <= age_range[1]]
+        known_ages = _table_column(table, 'Age', 0).astype('Int64')
+        mask &= known_ages.between(age_range[0], age_range[1]).to_numpy(dtype=bool, na_value=False)
     
     # Minutes filter
+    minutes = _table_column(table, 'Minutes', 0)
     if min_minutes > 0:
-        filtered = [row for row in filtered if row.get('Minutes', 0) >= min_minutes]
+        mask &= (minutes >= min_minutes).to_numpy(dtype=bool)
     
-    # Sort by Player name (A-Z), then by Minutes (desc)
-    filtered.sort(key=lambda x: (x.get('Player', ''), -x.get('Minutes', 0)))
-    
-    return filtered
+    # Sort by Player name (A-Z), then by Minutes (desc); ties keep table order
+    sort_keys = pd.DataFrame({
+        'player': _table_column(table, 'Player', '')[mask],
+        'minutes': minutes[mask]
+    })
+    order = sort_keys.sort_values(['player', 'minutes'], ascending=[True, False], kind='stable').index
+    return table.loc[order].drop(columns=['_player_lc'], errors='ignore')
 
 
 # ===== UI (STREAMLIT BELOW) =====
@@ -293,18 +327,32 @@ with col1:
 with col2:
     refresh_clicked = st.button("🔄 Refresh", type="primary")
 
+@st.cache_data(show_spinner=False, ttl=3600)
+def load_season_rows(competition_id: int, season_id: int, _raw_data: dict) -> dict | None:
+    """Compute the table data for a complete season fetch (shared across sessions for an hour)."""
+    return feature_compute_rows(_raw_data)
+
+
+def get_season_rows(competition_id: int, season_id: int) -> dict | None:
+    """Season table data: shared when complete, otherwise computed only for this session."""
+    raw_data = feature_fetch_season(client, competition_id=competition_id, season_id=season_id)
+    if not raw_data:
+        return None
+    # Only complete results (player stats joined with the mapping) are shared
+    if not raw_data.get('mapping'):
+        return feature_compute_rows(raw_data)
+    return load_season_rows(competition_id, season_id, raw_data)
+
+
 # Cache key for session state
 cache_key = f"player_data_{competition_id}_{season_id}"
 
 # Fetch data if not cached or refresh requested
 if cache_key not in st.session_state or refresh_clicked:
+    if refresh_clicked:
+        load_season_rows.clear()
     with st.spinner("Loading data from StatsBomb API..."):
-        raw_data = feature_fetch_season(client, competition_id=competition_id, season_id=season_id)
-        if raw_data:
-            computed_data = feature_compute_rows(raw_data)
-            st.session_state[cache_key] = computed_data
-        else:
-            st.session_state[cache_key] = None
+        st.session_state[cache_key] = get_season_rows(competition_id, season_id)
 
 # Get cached data
 computed_data = st.session_state.get(cache_key)
@@ -348,7 +396,7 @@ if computed_data is not None and computed_data.get('rows'):
     with col3:
         # Age range filter
         # Minutes filter
-        max_minutes = int(max([row.get('Minutes', 0) for row in rows])) if rows else 0
+        max_minutes = computed_data.get('max_minutes', 0)
         
         if max_minutes > 0:
             min_minutes = st.slider(
@@ -374,8 +422,8 @@ if computed_data is not None and computed_data.get('rows'):
             age_range = (0, 100)
     
     # Apply filters
-    filtered_rows = feature_filter_rows(
-        rows,
+    filtered = feature_filter_rows(
+        computed_data['table'],
         q=search_query,
         teams=selected_teams,
         positions=selected_positions,
@@ -383,17 +431,17 @@ if computed_data is not None and computed_data.get('rows'):
         age_range=age_range,
         min_minutes=min_minutes
     )
+    if 'Age' in filtered.columns:
+        filtered['Age'] = filtered['Age'].astype(object).fillna('—')
     
-    st.info(f"Showing {len(filtered_rows)} of {len(rows)} players")
+    st.info(f"Showing {len(filtered)} of {len(rows)} players")
     
     # Display table
-    if filtered_rows:
-        # Convert to DataFrame for display
-        import pandas as pd
-        df = pd.DataFrame(filtered_rows)
-        
-        # Remove player_id from display
-        display_df = df.drop(columns=['player_id'], errors='ignore')
+    if not filtered.empty:
+        # Remove player_id and the raw position columns from display (column dtypes inferred as for a fresh DataFrame)
+        display_df = filtered.drop(
+            columns=['player_id', '_primary_position', '_secondary_position'], errors='ignore'
+        ).infer_objects()
         
         # Display table with selection
         selected_rows = st.dataframe(
@@ -407,7 +455,7 @@ if computed_data is not None and computed_data.get('rows'):
         # Row actions
         if selected_rows.selection.rows:
             selected_idx = selected_rows.selection.rows[0]
-            selected_player = filtered_rows[selected_idx]
+            selected_player = filtered.iloc[selected_idx].to_dict()
             player_id = selected_player.get('player_id')
             player_name = selected_player.get('Player')
             team_name = selected_player.get('Team')
@@ -459,9 +507,9 @@ if computed_data is not None and computed_data.get('rows'):
                 # Get tactical profile service
                 service = get_service()
                 
-                # Parse position
-                primary_position = position.split(' / ')[0] if position else None
-                secondary_position = position.split(' / ')[1] if ' / ' in position else None
+                # Positions precomputed with the table
+                primary_position = selected_player.get('_primary_position') if position else None
+                secondary_position = selected_player.get('_secondary_position')
                 
                 # Determine position group
                 position_group = service.get_position_group(primary_position, secondary_position)
@@ -0,0 +1,93 @@
+"""
+Merge the per-season performance parquet files into one Arrow IPC (Feather v2) file.
+
+performance_percentiles, performance_raw_metrics and performance_axis_scores
+carry the same rows (one per striker, same order) with a duplicated player_id
+column. This script writes them side by side to performance_all.feather:
+
+- player_id stored once, dictionary-encoded
+- every other column prefixed with its metric family ("percentiles/",
+  "raw_metrics/", "axis_scores/"), so shared columns like season_id don't clash
+
+PerformanceLoader reads this file (memory-mapped) whenever it exists, without
+re-checking the sources. The SHA-256 digest of each source parquet file is stored
+in the schema metadata so the test suite can catch a merged file that is out of
+date. Rerun this script after regenerating the performance artifacts.
+"""
+
+import hashlib
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Paths
+ARTIFACTS_ROOT = "data/processed"
+COMBINED_FILE = "performance_all.feather"
+GROUPS = {
+    "percentiles": "performance_percentiles.parquet",
+    "raw_metrics": "performance_raw_metrics.parquet",
+    "axis_scores": "performance_axis_scores.parquet",
+}
+
+
+def build_combined_table(artifacts_dir):
+    """Merge the family parquet files of one artifacts directory into a single table."""
+    tables = {
+        group: pq.read_table(os.path.join(artifacts_dir, filename))
+        for group, filename in GROUPS.items()
+        if os.path.exists(os.path.join(artifacts_dir, filename))
+    }
+    if not tables:
+        return None
+
+    # Families must describe the same rows in the same order
+    player_ids = [table.column("player_id") for table in tables.values()]
+    if any(not ids.equals(player_ids[0]) for ids in player_ids[1:]):
+        raise ValueError("player_id rows differ between performance files")
+
+    names = ["player_id"]
+    columns = [player_ids[0].cast(pa.string()).combine_chunks().dictionary_encode()]
+    for group, table in tables.items():
+        for name in table.column_names:
+            if name != "player_id":
+                names.append(f"{group}/{name}")
+                columns.append(table.column(name))
+
+    source_sha256 = {}
+    for group, filename in GROUPS.items():
+        if group in tables:
+            with open(os.path.join(artifacts_dir, filename), "rb") as f:
+                source_sha256[filename] = hashlib.sha256(f.read()).hexdigest()
+    return pa.table(columns, names=names).replace_schema_metadata(
+        {"source_sha256": json.dumps(source_sha256)}
+    )
+
+
+def build_all():
+    """Write performance_all.feather for every performance artifacts directory."""
+    for entry in sorted(os.listdir(ARTIFACTS_ROOT)):
+        artifacts_dir = os.path.join(ARTIFACTS_ROOT, entry)
+        if not entry.startswith("performance_artifacts") or not os.path.isdir(artifacts_dir):
+            continue
+
+        try:
+            table = build_combined_table(artifacts_dir)
+        except Exception as e:
+            print(f"⚠️ Skipping {artifacts_dir}: {e}")
+            continue
+
+        if table is None:
+            print(f"⚠️ No performance parquet files in {artifacts_dir}")
+            continue
+
+        output_path = os.path.join(artifacts_dir, COMBINED_FILE)
+        with pa.OSFile(output_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        print(f"✓ {output_path}: {table.num_rows} rows, {table.num_columns} columns")
+
+
+if __name__ == "__main__":
+    build_all()
@@ -13,6 +13,13 @@ from sklearn.metrics.pairwise import cosine_similarity
 # Paths
 ARTIFACTS_ROOT = "data/processed/roles"
 
+
+def style_vector_columns(style_df):
+    """Full-precision unit_pca_* columns, or the pca_* columns of artifacts written before they existed."""
+    unit_cols = [c for c in style_df.columns if c.startswith('unit_pca_')]
+    return unit_cols or [c for c in style_df.columns if c.startswith('pca_')]
+
+
 def generate_neighbors(top_k=10):
     """Build and save multi-season neighbor similarity data."""
     
@@ -47,50 +54,40 @@ def generate_neighbors(top_k=10):
     
     print(f"\n📊 Building neighbor similarity from {len(all_season_data)} seasons...\n")
     
-    # Combine all PCA vectors
-    combined_vectors = []
-    combined_metadata = []
-    
-    for season_id, style_df in all_season_data:
-        pca_cols = [c for c in style_df.columns if c.startswith('pca_')]
-        vectors = style_df[pca_cols].values
-        
-        for position, (idx, row) in enumerate(style_df.iterrows()):
-            combined_vectors.append(vectors[position])
-            combined_metadata.append({
-                'player_id': int(row['player_id']),
-                'season_id': int(row['season_id']),
-            })
-    
-    combined_vectors = np.array(combined_vectors)
+    # Combine all PCA vectors and ids column-wise (one row per player-season)
+    combined_vectors = np.concatenate([
+        style_df[style_vector_columns(style_df)].to_numpy(dtype=np.float64)
+        for _, style_df in all_season_data
+    ])
+    player_ids = np.concatenate([style_df['player_id'].to_numpy(dtype=np.int64) for _, style_df in all_season_data])
+    season_ids = np.concatenate([style_df['season_id'].to_numpy(dtype=np.int64) for _, style_df in all_season_data])
     print(f"🔍 Computing similarity for {len(combined_vectors)} player-seasons...")
     
     # Compute pairwise cosine similarity
     similarity_matrix = cosine_similarity(combined_vectors)
     
-    # Extract top-K neighbors for each row
-    neighbors_list = []
-    
-    for i in range(len(combined_metadata)):
-        anchor = combined_metadata[i]
-        sims = similarity_matrix[i]
-        
-        # Get indices sorted by similarity (excluding self at index i)
-        neighbor_indices = np.argsort(-sims)[1:top_k+1]
-        
-        for neighbor_idx in neighbor_indices:
-            neighbor = combined_metadata[neighbor_idx]
-            sim_score = float(sims[neighbor_idx])
-            
-            neighbors_list.append({
-                'anchor_player_id': anchor['player_id'],
-                'anchor_season_id': anchor['season_id'],
-                'neighbor_player_id': neighbor['player_id'],
-                'neighbor_season_id': neighbor['season_id'],
-                'cosine_sim': sim_score
-            })
+    # Top-K neighbors for every row at once: top-(K+1) per row without sorting the whole row,
+    # then the anchor itself is masked out by index (not by rank: identical player-seasons
+    # tie with it at similarity 1)
+    n_rows = len(similarity_matrix)
+    n_keep = min(top_k + 1, n_rows)
+    n_neighbors = n_keep - 1
+    if n_keep < n_rows:
+        candidates = np.argpartition(-similarity_matrix, n_keep - 1, axis=1)[:, :n_keep]
+    else:
+        candidates = np.tile(np.arange(n_rows), (n_rows, 1))
+    candidate_sims = np.take_along_axis(similarity_matrix, candidates, axis=1)
+    candidate_sims[candidates == np.arange(n_rows)[:, None]] = -np.inf
+    order = np.argsort(-candidate_sims, axis=1, kind='stable')[:, :n_neighbors]
+    neighbor_indices = np.take_along_axis(candidates, order, axis=1)
     
-    neighbors_df = pd.DataFrame(neighbors_list)
+    neighbors_df = pd.DataFrame({
+        'anchor_player_id': np.repeat(player_ids, n_neighbors),
+        'anchor_season_id': np.repeat(season_ids, n_neighbors),
+        'neighbor_player_id': player_ids[neighbor_indices.ravel()],
+        'neighbor_season_id': season_ids[neighbor_indices.ravel()],
+        'cosine_sim': np.take_along_axis(similarity_matrix, neighbor_indices, axis=1).ravel()
+    })
     neighbors_path = os.path.join(ARTIFACTS_ROOT, "player_neighbors.parquet")
     neighbors_df.to_parquet(neighbors_path, index=False)
     
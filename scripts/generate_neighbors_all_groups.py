@@ -47,33 +47,32 @@ def generate_neighbors_for_group(artifacts_dir: str, top_k: int = 10):
     # Compute pairwise Euclidean distance
     distance_matrix = euclidean_distances(vectors)
     
-    # Build neighbor records
-    neighbors_list = []
-    
-    for i, anchor_id in enumerate(player_season_ids):
-        # Get distances for this player (excluding self)
-        distances = distance_matrix[i]
-        
-        # Get indices of top-K closest neighbors (lowest distance, excluding self at index i)
-        neighbor_indices = np.argsort(distances)[1:top_k+1]
-        
-        for neighbor_idx in neighbor_indices:
-            neighbor_id = player_season_ids[neighbor_idx]
-            distance = distances[neighbor_idx]
-            
-            # Convert distance to similarity (0-1, where 0=far, 1=identical)
-            # Using inverse: similarity = 1 / (1 + distance)
-            similarity = 1.0 / (1.0 + distance)
-            
-            neighbors_list.append({
-                'anchor_player_season_id': anchor_id,
-                'neighbor_player_season_id': neighbor_id,
-                'euclidean_distance': float(distance),
-                'similarity': float(similarity)
-            })
+    # Top-K closest neighbors for every player at once: lowest (K+1) distances per row without
+    # sorting the whole row, then the anchor itself is masked out by index (not by rank:
+    # identical players tie with it at distance 0)
+    n_rows = len(distance_matrix)
+    n_keep = min(top_k + 1, n_rows)
+    if n_keep < n_rows:
+        candidates = np.argpartition(distance_matrix, n_keep - 1, axis=1)[:, :n_keep]
+    else:
+        candidates = np.tile(np.arange(n_rows), (n_rows, 1))
+    candidate_distances = np.take_along_axis(distance_matrix, candidates, axis=1)
+    candidate_distances[candidates == np.arange(n_rows)[:, None]] = np.inf
+    order = np.argsort(candidate_distances, axis=1, kind='stable')[:, :n_keep - 1]
+    neighbor_indices = np.take_along_axis(candidates, order, axis=1)
+    distances = np.take_along_axis(candidate_distances, order, axis=1).ravel()
+    ids = np.asarray(player_season_ids, dtype=object)
+    
+    # Convert distance to similarity (0-1, where 0=far, 1=identical)
+    # Using inverse: similarity = 1 / (1 + distance)
+    neighbors_df = pd.DataFrame({
+        'anchor_player_season_id': np.repeat(ids, neighbor_indices.shape[1]),
+        'neighbor_player_season_id': ids[neighbor_indices.ravel()],
+        'euclidean_distance': distances,
+        'similarity': 1.0 / (1.0 + distances)
+    })
     
     # Save to parquet
-    neighbors_df = pd.DataFrame(neighbors_list)
     output_path = artifacts_path / "player_neighbors.parquet"
     neighbors_df.to_parquet(output_path, index=False)
     
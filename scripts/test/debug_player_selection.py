@@ -34,8 +34,8 @@ def debug_player_selection():
     # Check what player IDs are available in the data
     try:
         ability_scores = loader._ability_scores
-        if ability_scores is not None and not ability_scores.empty:
-            print(f"   Available player IDs in ability scores: {list(ability_scores.index)[:5]}...")
+        if ability_scores:
+            print(f"   Available player IDs in ability scores: {list(ability_scores.by_player_season)[:5]}...")
             print(f"   Total players in ability scores: {len(ability_scores)}")
         else:
             print("   No ability scores data loaded")
@@ -44,8 +44,8 @@ def debug_player_selection():
     
     try:
         percentiles = loader._percentiles
-        if percentiles is not None and not percentiles.empty:
-            print(f"   Available player IDs in percentiles: {list(percentiles.index)[:5]}...")
+        if percentiles:
+            print(f"   Available player IDs in percentiles: {list(percentiles.by_player_season)[:5]}...")
             print(f"   Total players in percentiles: {len(percentiles)}")
         else:
             print("   No percentiles data loaded")
@@ -0,0 +1,223 @@
+"""
+Unit tests for api/cache module.
+
+Tests:
+1. Season keys and TTLs
+2. On-disk cache (cached): hits, expiry, atomic writes
+3. In-process cache (memoize_ttl): hits, expiry, eviction, DataFrame copies
+"""
+
+import pytest
+import sys
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api import cache
+from api.cache import (
+    CLOSED_SEASON_TTL,
+    CURRENT_SEASON_TTL,
+    cached,
+    memoize_ttl,
+    season_key,
+    season_ttl,
+)
+
+
+class TestSeasonKeys:
+    """Test the (competition, season) key and TTL helpers."""
+    
+    def test_season_key(self):
+        """Test the cache key of a (competition, season) payload."""
+        assert season_key(73, 317) == "73_317"
+    
+    def test_season_ttl(self):
+        """Test that only the current season gets the short TTL."""
+        assert season_ttl(73, 317) == CURRENT_SEASON_TTL
+        assert season_ttl(73, "317") == CURRENT_SEASON_TTL
+        assert season_ttl(73, 281) == CLOSED_SEASON_TTL
+
+
+def _make_client(cache_dir: Path, result, ttl_seconds=60):
+    """Client whose fetch method returns result (called with a season) and counts its calls."""
+    class Client:
+        calls = 0
+
+        @cached(ttl_seconds=ttl_seconds, key_fn=season_key, cache_dir=cache_dir)
+        def fetch(self, competition_id: int, season_id: int):
+            Client.calls += 1
+            return result
+
+    return Client()
+
+
+class TestCached:
+    """Test the on-disk cache."""
+    
+    def test_json_payload_cached_on_disk(self, tmp_path):
+        """Test that a JSON payload is fetched once and then read from disk."""
+        client = _make_client(tmp_path, [{"player_id": 1}])
+        
+        assert client.fetch(73, 317) == [{"player_id": 1}]
+        assert client.fetch(competition_id=73, season_id=317) == [{"player_id": 1}]
+        assert client.calls == 1
+        assert sorted(p.name for p in (tmp_path / "fetch").iterdir()) == ["73_317.json"]
+    
+    def test_dataframe_payload_cached_as_parquet(self, tmp_path):
+        """Test that a DataFrame payload is stored as parquet and read back equal."""
+        df = pd.DataFrame({"player_id": [1, 2], "team_name": ["A", "B"]})
+        client = _make_client(tmp_path, df)
+        
+        client.fetch(73, 317)
+        pd.testing.assert_frame_equal(client.fetch(73, 317), df)
+        assert client.calls == 1
+        assert sorted(p.name for p in (tmp_path / "fetch").iterdir()) == ["73_317.parquet"]
+    
+    def test_expired_entry_refetched(self, tmp_path):
+        """Test that an entry older than the TTL is fetched again."""
+        client = _make_client(tmp_path, {"ok": True}, ttl_seconds=60)
+        client.fetch(73, 281)
+        
+        entry = tmp_path / "fetch" / "73_281.json"
+        stale = time.time() - 120
+        os.utime(entry, (stale, stale))
+        client.fetch(73, 281)
+        assert client.calls == 2
+    
+    def test_callable_ttl(self, tmp_path):
+        """Test that the TTL is computed from the call's arguments."""
+        client = _make_client(tmp_path, {"ok": True}, ttl_seconds=season_ttl)
+        client.fetch(73, 317)
+        client.fetch(73, 281)
+        
+        # Two hours old: expired for the current season only
+        stale = time.time() - 2 * 60 * 60
+        for name in ("73_317.json", "73_281.json"):
+            os.utime(tmp_path / "fetch" / name, (stale, stale))
+        client.fetch(73, 317)
+        client.fetch(73, 281)
+        assert client.calls == 3
+    
+    def test_none_not_cached(self, tmp_path):
+        """Test that None results are neither written nor reused."""
+        client = _make_client(tmp_path, None)
+        assert client.fetch(73, 317) is None
+        assert client.fetch(73, 317) is None
+        assert client.calls == 2
+        assert not (tmp_path / "fetch").exists()
+    
+    def test_unserializable_payload_leaves_no_files(self, tmp_path):
+        """Test that a failed write leaves neither an entry nor a temp file behind."""
+        client = _make_client(tmp_path, {"when": object()})
+        client.fetch(73, 317)
+        client.fetch(73, 317)
+        assert client.calls == 2
+        assert list((tmp_path / "fetch").iterdir()) == []
+    
+    def test_write_replaces_entry_atomically(self, tmp_path, monkeypatch):
+        """Test that the entry only appears once fully written, via a rename of a temp file."""
+        renames = []
+        real_replace = os.replace
+        
+        def record_replace(src, dst):
+            renames.append((Path(src).name, Path(dst).name, Path(dst).exists()))
+            real_replace(src, dst)
+        
+        monkeypatch.setattr(cache.os, "replace", record_replace)
+        client = _make_client(tmp_path, [1, 2, 3])
+        client.fetch(73, 317)
+        
+        assert len(renames) == 1
+        tmp_name, target_name, target_existed = renames[0]
+        assert tmp_name.startswith("73_317.json.") and tmp_name.endswith(".tmp")
+        assert target_name == "73_317.json"
+        assert not target_existed
+        assert sorted(p.name for p in (tmp_path / "fetch").iterdir()) == ["73_317.json"]
+
+
+class TestMemoizeTTL:
+    """Test the in-process cache."""
+    
+    @staticmethod
+    def _make_client(result_fn, ttl_seconds=60, maxsize=64):
+        class Client:
+            calls = 0
+            
+            @memoize_ttl(ttl_seconds=ttl_seconds, maxsize=maxsize)
+            def fetch(self, competition_id: int, season_id: int = 317):
+                Client.calls += 1
+                return result_fn(competition_id, season_id)
+        
+        return Client()
+    
+    def test_hits_keyed_by_normalized_arguments(self):
+        """Test that positional, keyword and default arguments share one entry."""
+        client = self._make_client(lambda c, s: [c, s])
+        assert client.fetch(73) == [73, 317]
+        assert client.fetch(73, 317) == [73, 317]
+        assert client.fetch(season_id=317, competition_id=73) == [73, 317]
+        assert client.calls == 1
+        
+        client.fetch(73, 281)
+        assert client.calls == 2
+    
+    def test_expired_entry_refetched(self, monkeypatch):
+        """Test that an entry is fetched again once its TTL has passed."""
+        now = [1000.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        client = self._make_client(lambda c, s: {"season": s}, ttl_seconds=60)
+        
+        client.fetch(73)
+        now[0] += 59
+        client.fetch(73)
+        assert client.calls == 1
+        now[0] += 2
+        client.fetch(73)
+        assert client.calls == 2
+    
+    def test_oldest_entry_evicted(self):
+        """Test that the least recently stored entry goes beyond maxsize."""
+        client = self._make_client(lambda c, s: {"competition": c}, maxsize=2)
+        for competition_id in (1, 2, 3):
+            client.fetch(competition_id)
+        
+        client.fetch(3)
+        client.fetch(2)
+        assert client.calls == 3
+        client.fetch(1)
+        assert client.calls == 4
+    
+    def test_none_not_cached(self):
+        """Test that None results are fetched again on every call."""
+        client = self._make_client(lambda c, s: None)
+        client.fetch(73)
+        client.fetch(73)
+        assert client.calls == 2
+    
+    def test_cache_clear(self):
+        """Test that cache_clear drops every entry."""
+        client = self._make_client(lambda c, s: {"season": s})
+        client.fetch(73)
+        type(client).fetch.cache_clear()
+        client.fetch(73)
+        assert client.calls == 2
+    
+    def test_dataframes_handed_out_as_copies(self):
+        """Test that column changes by one caller don't reach the next caller."""
+        client = self._make_client(lambda c, s: pd.DataFrame({"player_id": [1, 2], "minutes": [90, 45]}))
+        
+        first = client.fetch(73)
+        first["team_name"] = ["A", "B"]
+        first.rename(columns={"minutes": "Minutes"}, inplace=True)
+        
+        second = client.fetch(73)
+        assert list(second.columns) == ["player_id", "minutes"]
+        second.drop(columns=["minutes"], inplace=True)
+        
+        assert list(client.fetch(73).columns) == ["player_id", "minutes"]
+        assert client.calls == 1
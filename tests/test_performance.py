@@ -0,0 +1,202 @@
+"""
+Unit tests for core/performance module.
+
+Tests:
+1. Merged performance_all.feather files match their parquet sources
+2. PerformanceLoader lookups (parquet and merged file)
+"""
+
+import pytest
+import sys
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.performance.loader import PerformanceLoader
+from scripts.build_performance_feather import COMBINED_FILE, GROUPS, build_combined_table
+
+PROCESSED_DIR = Path(__file__).parent.parent / "data" / "processed"
+COMBINED_DIRS = sorted(path.parent for path in PROCESSED_DIR.glob(f"performance_artifacts*/{COMBINED_FILE}"))
+
+
+def _read_combined(artifacts_dir: Path) -> pa.Table:
+    with pa.memory_map(str(artifacts_dir / COMBINED_FILE)) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+class TestCombinedPerformanceFile:
+    """Test that the committed merged files are up to date (rerun scripts/build_performance_feather.py if not)."""
+    
+    def test_combined_files_exist(self):
+        """Test that every performance artifacts directory has a merged file."""
+        assert COMBINED_DIRS
+    
+    @pytest.mark.parametrize("artifacts_dir", COMBINED_DIRS, ids=lambda path: path.name)
+    def test_source_digests_match(self, artifacts_dir):
+        """Test that the recorded SHA-256 of each source parquet matches the file on disk."""
+        recorded = json.loads(_read_combined(artifacts_dir).schema.metadata[b"source_sha256"])
+        current = {
+            filename: hashlib.sha256((artifacts_dir / filename).read_bytes()).hexdigest()
+            for filename in GROUPS.values() if (artifacts_dir / filename).exists()
+        }
+        assert recorded == current
+    
+    @pytest.mark.parametrize("artifacts_dir", COMBINED_DIRS, ids=lambda path: path.name)
+    def test_columns_match_parquet_sources(self, artifacts_dir):
+        """Test that every family's columns equal the ones in its parquet file."""
+        combined = _read_combined(artifacts_dir)
+        for group, filename in GROUPS.items():
+            if not (artifacts_dir / filename).exists():
+                continue
+            source = pq.read_table(artifacts_dir / filename)
+            assert combined.column("player_id").cast(pa.string()).equals(
+                source.column("player_id").cast(pa.string())
+            )
+            for name in source.column_names:
+                if name != "player_id":
+                    assert combined.column(f"{group}/{name}").equals(source.column(name)), (group, name)
+
+
+AXES = [
+    {"key": "finishing", "label": "Finishing", "metrics": ["np_xg_90", "touches_box_90"]},
+    {"key": "creation", "label": "Creation", "metrics": ["xa_90"]},
+]
+
+
+def _write_artifacts(artifacts_dir: Path) -> None:
+    """Small performance artifacts: a duplicated player, a missing percentile and a missing raw value."""
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    player_ids = ["p1", "p2", "p1", "101"]
+    pd.DataFrame({
+        "player_id": player_ids,
+        "np_xg_90_percentile": [80.0, np.nan, 10.0, 50.0],
+        "touches_box_90_percentile": [60.0, 40.0, 20.0, 25.5],
+        "xa_90_percentile": [30.0, 90.0, 0.0, 75.0],
+    }).to_parquet(artifacts_dir / GROUPS["percentiles"], index=False)
+    pd.DataFrame({
+        "player_id": player_ids,
+        "np_xg_90": [0.45, 0.12, 0.05, 0.3],
+        "touches_box_90": [6.1, np.nan, 1.0, 4.2],
+        "xa_90": [0.1, 0.35, 0.0, 0.25],
+    }).to_parquet(artifacts_dir / GROUPS["raw_metrics"], index=False)
+    pd.DataFrame({
+        "player_id": player_ids,
+        "finishing_score": [70.0, 40.0, 15.0, 37.75],
+        "creation_score": [30.0, np.nan, 0.0, 75.0],
+    }).to_parquet(artifacts_dir / GROUPS["axis_scores"], index=False)
+    (artifacts_dir / "performance_axes.json").write_text(json.dumps(AXES))
+    (artifacts_dir / "performance_benchmarks.json").write_text(json.dumps({"np_xg_90": {"median": 0.2, "p80": 0.4}}))
+    (artifacts_dir / "performance_minmax.json").write_text(json.dumps({"np_xg_90": {"min": 0.0, "max": 0.5}}))
+    (artifacts_dir / "performance_config.json").write_text(json.dumps({"minutes_threshold": 900, "season": "2023/24"}))
+
+
+def _write_combined(artifacts_dir: Path) -> None:
+    table = build_combined_table(str(artifacts_dir))
+    with pa.OSFile(str(artifacts_dir / COMBINED_FILE), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+@pytest.fixture(params=["parquet", "combined"])
+def loader(request, tmp_path):
+    """Loader over the small artifacts, read from the parquet files or from the merged file."""
+    _write_artifacts(tmp_path)
+    if request.param == "combined":
+        _write_combined(tmp_path)
+    return PerformanceLoader(artifacts_dir=str(tmp_path))
+
+
+class TestPerformanceLoader:
+    """Test PerformanceLoader lookups on small on-disk artifacts."""
+    
+    def test_player_metric_row(self, loader):
+        """Test percentiles per metric (missing values as None, first row wins for duplicates)."""
+        assert loader.get_player_metric_row("p1") == {
+            "np_xg_90": {"percentile": 80.0},
+            "touches_box_90": {"percentile": 60.0},
+            "xa_90": {"percentile": 30.0},
+        }
+        assert loader.get_player_metric_row("p2")["np_xg_90"] == {"percentile": None}
+        assert loader.get_player_metric_row("missing") is None
+    
+    def test_player_raw_metrics(self, loader):
+        """Test raw metrics (missing values as 0.0)."""
+        assert loader.get_player_raw_metrics("p1") == {"np_xg_90": 0.45, "touches_box_90": 6.1, "xa_90": 0.1}
+        assert loader.get_player_raw_metrics("p2")["touches_box_90"] == 0.0
+        assert loader.get_player_raw_metrics("missing") is None
+    
+    def test_player_axis_scores(self, loader):
+        """Test axis scores (missing values as 0.0)."""
+        assert loader.get_player_axis_scores("p1") == {"finishing": 70.0, "creation": 30.0}
+        assert loader.get_player_axis_scores("p2") == {"finishing": 40.0, "creation": 0.0}
+        assert loader.get_player_axis_scores("missing") is None
+    
+    def test_player_id_matched_as_str(self, loader):
+        """Test that numeric player ids find their string rows."""
+        assert loader.has_player(101)
+        assert loader.has_player("101")
+        assert not loader.has_player(102)
+        assert loader.get_player_axis_scores(101) == {"finishing": 37.75, "creation": 75.0}
+    
+    def test_value_rows_follow_compiled_axes(self, loader):
+        """Test that the compiled axis columns index the player's value rows."""
+        percentiles, raw, scores = loader.get_player_value_rows("p1")
+        compiled = {axis[0]: axis for axis in loader.get_axes_compiled()}
+        
+        key, label, metrics, percentile_cols, raw_cols, score_col = compiled["finishing"]
+        assert (label, metrics) == ("Finishing", ("np_xg_90", "touches_box_90"))
+        assert [float(percentiles[i]) for i in percentile_cols] == [80.0, 60.0]
+        assert [float(raw[i]) for i in raw_cols] == [0.45, 6.1]
+        assert float(scores[score_col]) == 70.0
+        
+        assert loader.get_player_value_rows("missing") == (None, None, None)
+    
+    def test_json_artifacts(self, loader):
+        """Test axes, benchmarks, min/max and config lookups."""
+        assert loader.get_all_metrics() == ["np_xg_90", "touches_box_90", "xa_90"]
+        assert loader.get_axis_metrics("finishing") == ["np_xg_90", "touches_box_90"]
+        assert loader.get_axis_metrics("unknown") == []
+        assert loader.get_benchmarks_bulk(["np_xg_90", "xa_90"]) == {"np_xg_90": {"median": 0.2, "p80": 0.4}}
+        assert loader.get_minmax("np_xg_90") == {"min": 0.0, "max": 0.5}
+        assert loader.get_minutes_threshold() == 900
+        assert loader.get_season() == "2023/24"
+        assert loader.is_loaded()
+    
+    def test_artifact_version_changes_with_files(self, tmp_path):
+        """Test that rewriting an artifact file gives a new loader a new version."""
+        _write_artifacts(tmp_path)
+        version = PerformanceLoader(artifacts_dir=str(tmp_path)).get_artifact_version()
+        assert version
+        
+        (tmp_path / "performance_config.json").write_text(json.dumps({"minutes_threshold": 600, "season": "2023/24"}))
+        assert PerformanceLoader(artifacts_dir=str(tmp_path)).get_artifact_version() != version
+
+
+class TestCombinedFileLookups:
+    """Test that the committed merged files give the same lookups as their parquet sources."""
+    
+    @pytest.mark.parametrize("artifacts_dir", COMBINED_DIRS, ids=lambda path: path.name)
+    def test_lookups_match_parquet_files(self, artifacts_dir, tmp_path):
+        """Test every player's lookups with and without the merged file."""
+        for path in artifacts_dir.iterdir():
+            if path.name != COMBINED_FILE:
+                shutil.copy(path, tmp_path / path.name)
+        combined = PerformanceLoader(artifacts_dir=str(artifacts_dir))
+        parquet = PerformanceLoader(artifacts_dir=str(tmp_path))
+        
+        player_ids = pq.read_table(artifacts_dir / GROUPS["percentiles"], columns=["player_id"]).column("player_id")
+        for player_id in player_ids.cast(pa.string()).to_pylist():
+            assert combined.has_player(player_id) == parquet.has_player(player_id)
+            assert combined.get_player_metric_row(player_id) == parquet.get_player_metric_row(player_id)
+            assert combined.get_player_raw_metrics(player_id) == parquet.get_player_raw_metrics(player_id)
+            assert combined.get_player_axis_scores(player_id) == parquet.get_player_axis_scores(player_id)
+        assert combined.get_axes_compiled() == parquet.get_axes_compiled()
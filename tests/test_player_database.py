@@ -0,0 +1,204 @@
+"""
+Unit tests for the Player Database page's business logic.
+
+Tests:
+1. Joining season stats with the player mapping (feature_compute_rows)
+2. Position display and mapping fallbacks for missing (NaN) values
+3. Filtering and sorting the rows table (feature_filter_rows)
+
+The page runs Streamlit at import time, so only its business logic section
+(between the BUSINESS LOGIC and UI markers, no Streamlit there) is loaded.
+"""
+
+import pytest
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+PAGE_PATH = Path(__file__).parent.parent / "pages" / "1_Player_Database.py"
+
+
+def _load_business_logic() -> dict:
+    """Execute the page's business logic section and return its namespace."""
+    source = PAGE_PATH.read_text(encoding="utf-8")
+    start = source.index("# ===== BUSINESS LOGIC")
+    end = source.index("# ===== UI (STREAMLIT BELOW)")
+    namespace = {"np": np, "pd": pd}
+    exec(compile(source[start:end], str(PAGE_PATH), "exec"), namespace)
+    return namespace
+
+
+_logic = _load_business_logic()
+feature_compute_rows = _logic["feature_compute_rows"]
+feature_filter_rows = _logic["feature_filter_rows"]
+
+
+def _age(birth_date: str) -> int:
+    born = date.fromisoformat(birth_date)
+    today = date.today()
+    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+
+
+def _stats_row(player_id, name, team, primary, secondary, minutes, goals_90=0.0, assists_90=0.0, appearances=10):
+    return {
+        'player_id': player_id,
+        'player_name': name,
+        'team_name': team,
+        'primary_position': primary,
+        'secondary_position': secondary,
+        'player_season_minutes': minutes,
+        'player_season_appearances': appearances,
+        'player_season_goals_90': goals_90,
+        'player_season_assists_90': assists_90,
+    }
+
+
+def _payload() -> dict:
+    """Season payload with an unmapped player, a NaN secondary position and a NaN mapping player_id."""
+    season_stats = [
+        _stats_row(1, "Carlos Ruiz", "Tigres", "Centre Forward", "Left Wing", 1800.4, goals_90=0.5, assists_90=0.25),
+        _stats_row(2, "ana lópez", "América", "Left Back", None, 900, assists_90=0.1),
+        _stats_row(3, "Bruno Díaz", "Tigres", "Goalkeeper", "—", 0, goals_90=0.3),
+        _stats_row(4, "Emilio Sosa", "Pumas", "Centre Forward", float('nan'), 450.5, goals_90=1.0),
+        _stats_row(5, "Diego Mar", "América", "Left Back", "", 2700, goals_90=0.05),
+    ]
+    mapping = [
+        {'player_id': 1, 'offline_player_id': 101, 'player_preferred_foot': "Right", 'player_birth_date': "1995-03-12"},
+        {'player_id': 2, 'offline_player_id': 102, 'player_preferred_foot': "Left", 'player_birth_date': "bad"},
+        # Mapping rows without a player_id fall back to the offline id
+        {'player_id': float('nan'), 'offline_player_id': 4, 'player_preferred_foot': "Both", 'player_birth_date': "2001-12-31"},
+        # The last row wins for a duplicated player
+        {'player_id': 5, 'offline_player_id': 105, 'player_preferred_foot': "Left", 'player_birth_date': "1990-01-01"},
+        {'player_id': 5, 'offline_player_id': 105, 'player_preferred_foot': "Right", 'player_birth_date': "1988-02-29"},
+    ]
+    return {'season_stats': season_stats, 'mapping': mapping}
+
+
+@pytest.fixture
+def computed():
+    return feature_compute_rows(_payload())
+
+
+def _filter(table, **overrides):
+    """feature_filter_rows with no filter applied except the overrides."""
+    kwargs = dict(q="", teams=[], positions=[], foots=[], age_range=(0, 100), min_minutes=0)
+    kwargs.update(overrides)
+    return feature_filter_rows(table, **kwargs)
+
+
+class TestComputeRows:
+    """Test the join of season stats with the player mapping."""
+    
+    def test_rows(self, computed):
+        """Test the table rows (totals from per-90 rates, foot and age from the mapping)."""
+        assert computed['rows'] == [
+            {'player_id': 1, 'Player': "Carlos Ruiz", 'Team': "Tigres", 'Position': "Centre Forward / Left Wing",
+             'Minutes': 1800, 'Appearances': 10, 'Goals': 10, 'Assists': 5, 'Foot': "Right", 'Age': _age("1995-03-12")},
+            {'player_id': 2, 'Player': "ana lópez", 'Team': "América", 'Position': "Left Back",
+             'Minutes': 900, 'Appearances': 10, 'Goals': 0, 'Assists': 1, 'Foot': "Left", 'Age': '—'},
+            {'player_id': 3, 'Player': "Bruno Díaz", 'Team': "Tigres", 'Position': "Goalkeeper",
+             'Minutes': 0, 'Appearances': 10, 'Goals': 0, 'Assists': 0, 'Foot': '—', 'Age': '—'},
+            {'player_id': 4, 'Player': "Emilio Sosa", 'Team': "Pumas", 'Position': "Centre Forward",
+             'Minutes': 450, 'Appearances': 10, 'Goals': 5, 'Assists': 0, 'Foot': "Both", 'Age': _age("2001-12-31")},
+            {'player_id': 5, 'Player': "Diego Mar", 'Team': "América", 'Position': "Left Back",
+             'Minutes': 2700, 'Appearances': 10, 'Goals': 2, 'Assists': 0, 'Foot': "Right", 'Age': _age("1988-02-29")},
+        ]
+    
+    def test_nan_secondary_position_not_shown(self, computed):
+        """Test that a NaN secondary position (as read from a DataFrame) is not displayed as ' / nan'."""
+        positions = [row['Position'] for row in computed['rows']]
+        assert "Centre Forward" in positions
+        assert not any("nan" in position for position in positions)
+        assert computed['table']['_secondary_position'].tolist() == ["Left Wing", None, None, None, None]
+    
+    def test_nan_mapping_player_id_uses_offline_id(self, computed):
+        """Test that a mapping row with a NaN player_id is joined on its offline id."""
+        row = computed['rows'][3]
+        assert (row['player_id'], row['Foot'], row['Age']) == (4, "Both", _age("2001-12-31"))
+    
+    def test_filter_options(self, computed):
+        """Test the filter widget options and bounds."""
+        ages = [_age("1995-03-12"), _age("2001-12-31"), _age("1988-02-29")]
+        assert computed['teams'] == ["América", "Pumas", "Tigres"]
+        assert computed['positions'] == ["Centre Forward", "Goalkeeper", "Left Back"]
+        assert computed['foots'] == ["Both", "Left", "Right", "—"]
+        assert (computed['age_min'], computed['age_max']) == (min(ages), max(ages))
+        assert computed['max_minutes'] == 2700
+    
+    def test_without_mapping(self):
+        """Test that players without mapping data get no foot or age."""
+        payload = _payload()
+        payload['mapping'] = None
+        computed = feature_compute_rows(payload)
+        assert {(row['Foot'], row['Age']) for row in computed['rows']} == {('—', '—')}
+        assert (computed['age_min'], computed['age_max']) == (0, 0)
+    
+    def test_team_level_fallback(self):
+        """Test that team-level rows are passed through as they are."""
+        team_rows = [{'team_name': "Tigres", 'team_season_goals': 40}, {'team_name': "Pumas", 'team_season_goals': 31}]
+        computed = feature_compute_rows({'season_stats': team_rows, 'mapping': None})
+        assert computed['rows'] == team_rows
+        assert computed['teams'] == ["Tigres", "Pumas"]
+        assert computed['positions'] == []
+    
+    @pytest.mark.parametrize("payload", [None, {'season_stats': None}, {'season_stats': [], 'mapping': []}])
+    def test_no_data(self, payload):
+        """Test that missing or empty payloads give no data."""
+        assert feature_compute_rows(payload) is None
+
+
+class TestFilterRows:
+    """Test filtering and sorting of the rows table."""
+    
+    @staticmethod
+    def _players(filtered: pd.DataFrame) -> list:
+        return filtered['Player'].tolist()
+    
+    def test_sorted_by_name_without_filters(self, computed):
+        """Test that all rows are returned sorted by Player, without helper columns in the display."""
+        filtered = _filter(computed['table'])
+        assert self._players(filtered) == ["Bruno Díaz", "Carlos Ruiz", "Diego Mar", "Emilio Sosa", "ana lópez"]
+        assert '_player_lc' not in filtered.columns
+    
+    def test_search_is_case_insensitive(self, computed):
+        """Test the substring search on player names, ignoring case."""
+        assert self._players(_filter(computed['table'], q="LÓP")) == ["ana lópez"]
+        assert self._players(_filter(computed['table'], q="ar")) == ["Carlos Ruiz", "Diego Mar"]
+    
+    def test_team_position_and_foot_filters(self, computed):
+        """Test the multiselect filters (positions match the primary position only)."""
+        table = computed['table']
+        assert self._players(_filter(table, teams=["Tigres"])) == ["Bruno Díaz", "Carlos Ruiz"]
+        assert self._players(_filter(table, positions=["Left Wing"])) == []
+        assert self._players(_filter(table, positions=["Centre Forward"])) == ["Carlos Ruiz", "Emilio Sosa"]
+        assert self._players(_filter(table, foots=["—", "Both"])) == ["Bruno Díaz", "Emilio Sosa"]
+    
+    def test_age_range_drops_unknown_ages(self, computed):
+        """Test that an age range keeps only players with a known age inside it."""
+        young = _age("2001-12-31")
+        assert self._players(_filter(computed['table'], age_range=(young, young))) == ["Emilio Sosa"]
+        assert len(_filter(computed['table'], age_range=(0, 100))) == 5
+    
+    def test_min_minutes(self, computed):
+        """Test that players below the minutes threshold are dropped."""
+        assert self._players(_filter(computed['table'], min_minutes=900)) == ["Carlos Ruiz", "Diego Mar", "ana lópez"]
+    
+    def test_equal_names_sorted_by_minutes(self):
+        """Test that players with the same name are ordered by minutes, most first."""
+        payload = {'season_stats': [
+            _stats_row(1, "Luis", "Tigres", "Left Back", None, 300),
+            _stats_row(2, "Luis", "Pumas", "Left Back", None, 1200),
+            _stats_row(3, "Luis", "Atlas", "Left Back", None, 300),
+        ], 'mapping': []}
+        filtered = _filter(feature_compute_rows(payload)['table'])
+        assert filtered['Team'].tolist() == ["Pumas", "Tigres", "Atlas"]
+    
+    def test_empty_table(self):
+        """Test that an empty table filters to an empty table."""
+        assert _filter(pd.DataFrame()).empty
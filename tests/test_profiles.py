@@ -0,0 +1,193 @@
+"""
+Unit tests for core/profiles module.
+
+Tests:
+1. TacticalProfileLoader row lookups (player_season_id, player_id + season, first season)
+2. Lookups on the committed striker artifacts match the DataFrame lookups
+3. Returned rows and reference data are copies of the shared cache
+"""
+
+import pytest
+import sys
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.profiles.loader import TacticalProfileLoader
+
+STRIKER_ARTIFACTS_DIR = Path(__file__).parent.parent / "data" / "processed" / "striker_artifacts"
+
+
+def _write_artifacts(artifacts_dir: Path) -> None:
+    """Small profile artifacts indexed by player_season_id (a player with two seasons, a duplicated row)."""
+    index = pd.Index(["10_317", "10_281", "20_317", "20_317", "3_1_108"], name="player_season_id")
+    pd.DataFrame({
+        "Progressive_Play": [0.5, 0.25, -1.0, 9.0, 0.0],
+        "Pressing_WorkRate": [1.5, np.nan, 0.75, 9.0, 2.0],
+    }, index=index).to_parquet(artifacts_dir / "ability_scores.parquet")
+    pd.DataFrame({
+        "Progressive_Play": [80.0, 55.0, 10.0, 99.0, 50.0],
+        "Pressing_WorkRate": [90.0, 20.0, 60.0, 99.0, 95.0],
+    }, index=index).to_parquet(artifacts_dir / "ability_percentiles.parquet")
+    pd.DataFrame({
+        "Progressive_Play": [1.2, 0.4, -0.8, 0.0, 0.1],
+    }, index=index).to_parquet(artifacts_dir / "ability_scores_zscore.parquet")
+    pd.DataFrame({
+        "anchor_player_season_id": ["10_317", "10_317", "10_317", "20_317"],
+        "neighbor_player_season_id": ["20_317", "3_1_108", "10_281", "10_317"],
+        "euclidean_distance": [0.5, 1.0, 3.0, 0.5],
+        "similarity": [1 / 1.5, 0.5, 0.25, 1 / 1.5],
+    }).to_parquet(artifacts_dir / "player_neighbors.parquet", index=False)
+    (artifacts_dir / "ability_axes.json").write_text(json.dumps([
+        {"key": "Progressive_Play", "label": "Progressive Play", "description": "Ball progression",
+         "pca_loadings": {"PC1": "+0.439 (carries)"}},
+        {"key": "Pressing_WorkRate", "label": "Pressing Work Rate", "description": "Pressure"},
+    ]))
+    (artifacts_dir / "league_reference.json").write_text(json.dumps({"Progressive_Play": 50.0}))
+    (artifacts_dir / "axis_ranges.json").write_text(json.dumps({"Progressive_Play": {"min": -2.0, "max": 2.0}}))
+
+
+@pytest.fixture
+def loader(tmp_path):
+    _write_artifacts(tmp_path)
+    return TacticalProfileLoader(artifacts_dir=str(tmp_path))
+
+
+def _dataframe_find(df: pd.DataFrame, player_id: str, season_id: str = None):
+    """Row lookup as done on the DataFrame (index match, else the first player_season_id of the player)."""
+    if season_id:
+        key = f"{player_id}_{season_id}"
+        return df.loc[key].to_dict() if key in df.index else None
+    if player_id in df.index:
+        return df.loc[player_id].to_dict()
+    for idx in df.index:
+        if str(idx).startswith(str(player_id) + '_'):
+            return df.loc[idx].to_dict()
+    return None
+
+
+def _same_row(actual, expected) -> bool:
+    """Rows compare equal, with NaN equal to NaN."""
+    if actual is None or expected is None:
+        return actual is expected
+    return actual.keys() == expected.keys() and all(
+        value == expected[key] or (
+            isinstance(value, float) and isinstance(expected[key], float)
+            and math.isnan(value) and math.isnan(expected[key])
+        )
+        for key, value in actual.items()
+    )
+
+
+class TestTacticalProfileLoader:
+    """Test TacticalProfileLoader lookups on small on-disk artifacts."""
+    
+    def test_lookup_by_player_and_season(self, loader):
+        """Test lookups by player_id + season_id."""
+        assert _same_row(loader.get_player_ability_scores("10", "281"), {"Progressive_Play": 0.25, "Pressing_WorkRate": np.nan})
+        assert loader.get_player_percentiles(10, 317) == {"Progressive_Play": 80.0, "Pressing_WorkRate": 90.0}
+        assert loader.get_player_ability_scores("10", "108") is None
+    
+    def test_lookup_without_season(self, loader):
+        """Test lookups by player_season_id and by player_id (its first season in file order)."""
+        assert loader.get_player_percentiles("10_281") == {"Progressive_Play": 55.0, "Pressing_WorkRate": 20.0}
+        assert loader.get_player_percentiles("10") == {"Progressive_Play": 80.0, "Pressing_WorkRate": 90.0}
+        assert loader.get_player_percentiles("3") == {"Progressive_Play": 50.0, "Pressing_WorkRate": 95.0}
+        assert loader.get_player_percentiles("3_1") == {"Progressive_Play": 50.0, "Pressing_WorkRate": 95.0}
+        assert loader.get_player_percentiles("1") is None
+    
+    def test_duplicate_rows_first_wins(self, loader):
+        """Test that a duplicated player_season_id resolves to its first row."""
+        assert loader.get_player_ability_scores("20", "317") == {"Progressive_Play": -1.0, "Pressing_WorkRate": 0.75}
+    
+    def test_has_player(self, loader):
+        """Test membership checks."""
+        assert loader.has_player("10")
+        assert loader.has_player("20", "317")
+        assert not loader.has_player("20", "281")
+        assert not loader.has_player("99")
+    
+    def test_player_artifacts(self, loader):
+        """Test that the combined lookup matches the individual getters."""
+        artifacts = loader.get_player_artifacts("10", "317")
+        assert artifacts == {
+            "ability_scores": loader.get_player_ability_scores("10", "317"),
+            "percentiles": loader.get_player_percentiles("10", "317"),
+            "ability_scores_zscore": loader.get_ability_scores_zscore("10", "317"),
+            "ability_scores_l2": None,
+        }
+        assert artifacts["ability_scores_zscore"] == {"Progressive_Play": 1.2}
+        
+        without_season = loader.get_player_artifacts("10")
+        assert without_season["percentiles"] == loader.get_player_percentiles("10")
+        assert without_season["ability_scores_zscore"] is None
+    
+    def test_neighbors(self, loader):
+        """Test top-K neighbors per anchor, in file order."""
+        neighbors = loader.get_neighbors("10_317", top_k=2)
+        assert [n["neighbor_player_season_id"] for n in neighbors] == ["20_317", "3_1_108"]
+        assert neighbors[0]["euclidean_distance"] == 0.5
+        assert loader.get_neighbors("3_1_108") == []
+    
+    def test_reference_data(self, loader):
+        """Test axes, league reference and axis ranges."""
+        axes = loader.get_axes()
+        assert [axis.key for axis in axes] == ["Progressive_Play", "Pressing_WorkRate"]
+        assert axes[0].pca_loadings == {"PC1": "+0.439 (carries)"}
+        assert axes[1].pca_loadings is None
+        assert loader.get_league_reference() == {"Progressive_Play": 50.0}
+        assert loader.get_axis_ranges() == {"Progressive_Play": {"min": -2.0, "max": 2.0}}
+
+
+class TestReturnedCopies:
+    """Test that callers can't change what later callers (or other loaders) get."""
+    
+    def test_rows_are_copies(self, loader, tmp_path):
+        """Test that changing a returned row leaves the cached rows alone."""
+        row = loader.get_player_percentiles("10", "317")
+        row["Progressive_Play"] = -1.0
+        loader.get_player_artifacts("10", "317")["ability_scores"].clear()
+        
+        other = TacticalProfileLoader(artifacts_dir=str(tmp_path))
+        assert other.get_player_percentiles("10", "317")["Progressive_Play"] == 80.0
+        assert loader.get_player_ability_scores("10", "317") == {"Progressive_Play": 0.5, "Pressing_WorkRate": 1.5}
+    
+    def test_reference_data_are_copies(self, loader):
+        """Test that changing returned axes, references and neighbors leaves the cache alone."""
+        loader.get_axes()[0].pca_loadings["PC1"] = "changed"
+        loader.get_league_reference()["Progressive_Play"] = 0.0
+        loader.get_axis_ranges()["Progressive_Play"]["max"] = 0.0
+        loader.get_neighbors("10_317")[0]["similarity"] = 0.0
+        
+        assert loader.get_axes()[0].pca_loadings == {"PC1": "+0.439 (carries)"}
+        assert loader.get_league_reference() == {"Progressive_Play": 50.0}
+        assert loader.get_axis_ranges()["Progressive_Play"] == {"min": -2.0, "max": 2.0}
+        assert loader.get_neighbors("10_317")[0]["similarity"] == pytest.approx(1 / 1.5)
+
+
+@pytest.mark.skipif(not STRIKER_ARTIFACTS_DIR.exists(), reason="striker artifacts not available")
+class TestStrikerArtifacts:
+    """Test lookups on the committed striker artifacts against the DataFrame lookups."""
+    
+    @pytest.mark.parametrize("filename, getter", [
+        ("ability_scores.parquet", "get_player_ability_scores"),
+        ("ability_percentiles.parquet", "get_player_percentiles"),
+    ])
+    def test_lookups_match_dataframe(self, filename, getter):
+        """Test every player_season_id with and without a season, and by player_id alone."""
+        df = pd.read_parquet(STRIKER_ARTIFACTS_DIR / filename)
+        # Duplicated player_season_ids resolve to their first row
+        df = df[~df.index.duplicated()]
+        lookup = getattr(TacticalProfileLoader(artifacts_dir=str(STRIKER_ARTIFACTS_DIR)), getter)
+        
+        for player_season_id in df.index:
+            player_id, _, season_id = str(player_season_id).rpartition('_')
+            assert _same_row(lookup(player_id, season_id), _dataframe_find(df, player_id, season_id))
+            assert _same_row(lookup(player_id), _dataframe_find(df, player_id))
+            assert _same_row(lookup(player_season_id), _dataframe_find(df, player_season_id))
@@ -6,18 +6,21 @@ Tests:
 2. Hybrid threshold behavior (< 0.60)
 3. Neighbor exclusion logic
 4. Confidence scoring
+5. RoleLoader lookups on on-disk artifacts
 """
 
 import pytest
 import sys
 import os
+import numpy as np
+import pandas as pd
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.roles.service import RoleService
-from core.roles.loader import RoleLoader
+from core.roles.loader import RoleLoader, _MISS_CACHE_SIZE
 
 
 class MockRoleLoader:
@@ -79,6 +82,17 @@ class MockRoleLoader:
         neighbors = all_neighbors.get((player_id, season_id), [])
         return neighbors[:top_k]
     
+    def gather_season_rows(self, table, player_ids, season_id, columns):
+        """Return mock rows for many players (found mask, {column: values})."""
+        get_row = self.get_player_cluster_probs if table == "cluster_probs" else self.get_player_style_row
+        rows = [get_row(player_id, season_id) for player_id in player_ids]
+        found = np.array([row is not None for row in rows], dtype=bool)
+        return found, {
+            column: np.array([row.get(column) if row else None for row in rows], dtype=object)
+            for column in columns
+            if any(row and column in row for row in rows)
+        }
+    
     def minutes_threshold(self):
         return 500
 
@@ -319,5 +333,155 @@ class TestInvalidData:
         assert service.is_valid_data(9999, 317) == False
 
 
+def _write_style_vectors(season_dir, rows):
+    """Write a player_style_vectors.parquet with the given (player_id, player_name) rows."""
+    os.makedirs(season_dir, exist_ok=True)
+    pd.DataFrame({
+        "player_id": [player_id for player_id, _ in rows],
+        "player_name": [name for _, name in rows],
+        "team_id": [100] * len(rows),
+        "minutes": [1000] * len(rows),
+        "season_id": [317] * len(rows),
+        **{f"pca_{i}": [0.1 * i] * len(rows) for i in range(1, 7)}
+    }).to_parquet(os.path.join(season_dir, "player_style_vectors.parquet"), index=False)
+
+
+@pytest.fixture
+def artifacts_root(tmp_path):
+    """Role artifacts for season 317 with a duplicated player and interleaved neighbor anchors."""
+    season_dir = tmp_path / "317"
+    _write_style_vectors(season_dir, [(1001, "First"), (1002, "Other"), (1001, "Duplicate")])
+    pd.DataFrame({
+        "player_id": [1001, 1002, 1001],
+        "cluster_0": [0.75, 0.40, 0.10],
+        "cluster_1": [0.15, 0.35, 0.10],
+        "cluster_2": [0.10, 0.25, 0.80],
+        "predicted_cluster": [0, 0, 2]
+    }).to_parquet(season_dir / "player_cluster_probs.parquet", index=False)
+    pd.DataFrame({
+        "anchor_player_id": [1001, 1002, 1001, 1001, 1002],
+        "anchor_season_id": [317, 317, 317, 317, 317],
+        "neighbor_player_id": [1003, 1001, 1002, 1004, 1003],
+        "neighbor_season_id": [317, 317, 317, 235, 317],
+        "cosine_sim": [0.92, 0.85, 0.88, 0.88, 0.80]
+    }).to_parquet(tmp_path / "player_neighbors.parquet", index=False)
+    return str(tmp_path)
+
+
+class TestRoleLoaderLookups:
+    """Test RoleLoader lookups against artifacts written to disk."""
+    
+    def test_duplicate_player_rows_first_row_wins(self, artifacts_root):
+        """Test that the first row of a duplicated player_id is returned."""
+        loader = RoleLoader(artifacts_root)
+        
+        assert loader.get_player_style_row(1001, 317)["player_name"] == "First"
+        assert loader.get_player_cluster_probs(1001, 317)["predicted_cluster"] == 0
+    
+    def test_player_id_str_and_int_are_equivalent(self, artifacts_root):
+        """Test that a numeric string player_id finds the same row as the int."""
+        loader = RoleLoader(artifacts_root)
+        
+        assert loader.get_player_style_row("1002", 317) == loader.get_player_style_row(1002, 317)
+        assert loader.get_player_cluster_probs("1002", 317) == loader.get_player_cluster_probs(1002, 317)
+        assert loader.get_player_style_row(1002, 317)["player_name"] == "Other"
+    
+    def test_non_integer_player_id_returns_none(self, artifacts_root):
+        """Test that ids that aren't integers return None instead of raising."""
+        loader = RoleLoader(artifacts_root)
+        
+        assert loader.get_player_style_row("abc", 317) is None
+        assert loader.get_player_cluster_probs(None, 317) is None
+    
+    def test_miss_cache_resets_when_full(self, artifacts_root):
+        """Test that remembered misses are bounded by _MISS_CACHE_SIZE."""
+        loader = RoleLoader(artifacts_root)
+        
+        assert loader.get_player_style_row(9999, 317) is None
+        assert ("style_vectors", 9999, 317) in loader._misses
+        
+        for player_id in range(_MISS_CACHE_SIZE):
+            loader._remember_miss("style_vectors", player_id, 317)
+        
+        assert len(loader._misses) <= _MISS_CACHE_SIZE
+        assert ("style_vectors", 9999, 317) not in loader._misses
+        assert loader.get_player_style_row(9999, 317) is None
+    
+    def test_clear_cache_rereads_artifacts(self, artifacts_root):
+        """Test that clear_cache drops cached rows and misses so new files are read."""
+        loader = RoleLoader(artifacts_root)
+        
+        assert loader.get_player_style_row(1001, 317)["player_name"] == "First"
+        assert loader.get_player_style_row(1005, 317) is None
+        
+        _write_style_vectors(os.path.join(artifacts_root, "317"), [(1001, "Renamed"), (1005, "New")])
+        
+        # Still served from the caches until they are cleared
+        assert loader.get_player_style_row(1001, 317)["player_name"] == "First"
+        assert loader.get_player_style_row(1005, 317) is None
+        
+        loader.clear_cache()
+        
+        assert not loader._misses
+        assert loader.get_player_style_row(1001, 317)["player_name"] == "Renamed"
+        assert loader.get_player_style_row(1005, 317)["player_name"] == "New"
+    
+    def test_clear_cache_invalidates_service_roles(self, artifacts_root):
+        """Test that role assignments memoized by the service are recomputed after clear_cache."""
+        loader = RoleLoader(artifacts_root)
+        service = RoleService(loader)
+        
+        assert service.get_player_role(1002, 317)["is_hybrid"] == True
+        
+        pd.DataFrame({
+            "player_id": [1002],
+            "cluster_0": [0.05],
+            "cluster_1": [0.90],
+            "cluster_2": [0.05],
+            "predicted_cluster": [1]
+        }).to_parquet(os.path.join(artifacts_root, "317", "player_cluster_probs.parquet"), index=False)
+        loader.clear_cache()
+        
+        role_data = service.get_player_role(1002, 317)
+        assert role_data["confidence"] == 0.9
+        assert role_data["is_hybrid"] == False
+    
+    def test_neighbors_keep_file_order_per_anchor(self, artifacts_root):
+        """Test that an anchor's neighbor rows keep their file order when interleaved with other anchors."""
+        loader = RoleLoader(artifacts_root)
+        
+        neighbors = loader.get_neighbors(1001, 317, top_k=10)
+        
+        assert [(n["neighbor_player_id"], n["neighbor_season_id"]) for n in neighbors] == [
+            (1003, 317), (1002, 317), (1004, 235)
+        ]
+        assert [n["neighbor_player_id"] for n in loader.get_neighbors(1001, 317, top_k=2)] == [1003, 1002]
+        assert [n["neighbor_player_id"] for n in loader.get_neighbors(1002, 317, top_k=10)] == [1001, 1003]
+    
+    def test_similar_players_match_per_neighbor_lookups(self, artifacts_root):
+        """Test that grouped neighbor lookups give each neighbor's own role, confidence and metadata."""
+        loader = RoleLoader(artifacts_root)
+        service = RoleService(loader)
+        
+        similar = service.get_similar_players(1001, 317, k=10)
+        
+        # 1003 and 1004 have no role rows, so only 1002 is returned
+        assert [(n["player_id"], n["season_id"]) for n in similar] == [(1002, 317)]
+        role_data = service.get_player_role(1002, 317)
+        assert similar[0]["role"] == role_data["role"]
+        assert similar[0]["confidence"] == role_data["confidence"]
+        assert similar[0]["similarity"] == 88
+        assert similar[0]["player_name"] == "Other"
+        assert similar[0]["team_id"] == 100
+    
+    def test_neighbors_are_copies(self, artifacts_root):
+        """Test that mutating returned neighbors does not change later results."""
+        loader = RoleLoader(artifacts_root)
+        
+        loader.get_neighbors(1001, 317)[0]["cosine_sim"] = 0.0
+        
+        assert loader.get_neighbors(1001, 317)[0]["cosine_sim"] == 0.92
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])